@@ -0,0 +1,143 @@
+"""
+Times AddonManager.generate() on synthetic catalogs (the same number of items, blocks, recipes and entities)
+and writes the results as json so runs can be compared
+
+Run from the repository root: python -m benchmarks.generate [--sizes 1000 10000 100000] [--output results.json]
+"""
+import argparse
+import concurrent.futures
+import datetime
+import json
+import multiprocessing
+import pathlib
+import platform
+import resource
+import subprocess
+import tempfile
+import time
+from src.addon_manager import AddonManager
+from src.block import Block
+from src.entity import Entity
+from src.item import Item
+from src.json_profile import JsonProfile
+from src.output import FileSystemSink
+from src.recipe import CraftingRecipeShapeless, RecipeIngredient
+
+def build_catalog(manager: AddonManager, size: int):
+    for index in range(size):
+        item = Item().set_id(f"item_{index}").set_display_name(f"Item {index}")
+        if index % 2:
+            item.set_food(index % 10)
+        manager.add_item(item)
+        manager.add_block(
+            Block()
+            .set_id(f"block_{index}")
+            .set_display_name(f"Block {index}")
+            .set_hardness(index % 5 + 0.5)
+        )
+        manager.add_recipe(
+            CraftingRecipeShapeless()
+            .set_item_id(f"block_{index}")
+            .set_ingredients(
+                [RecipeIngredient(item_id=f"{manager.namespace}:item_{index}", count=9)]
+            )
+            .set_result_item_id(f"block_{index}")
+        )
+        manager.add_entity(Entity().set_id(f"entity_{index}").set_name(f"Entity {index}"))
+
+
+def run(size: int, workers: int, processes: int, profile: str) -> dict:
+    """
+    One benchmark run, called in a fresh process so the peak memory is only this run
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        out = pathlib.Path(directory)
+        manager = AddonManager(
+            "Benchmark",
+            "Synthetic catalog",
+            "benchmark",
+            workers=workers,
+            processes=processes,
+            sink=FileSystemSink(out),
+            profile=JsonProfile(profile),
+        )
+        start = time.perf_counter()
+        build_catalog(manager, size)
+        catalog_seconds = time.perf_counter() - start
+
+        report = manager.generate()
+
+        files = [path for path in out.rglob("*") if path.is_file()]
+        return {
+            "size": size,
+            "workers": workers,
+            "processes": processes,
+            "profile": profile,
+            "catalog_seconds": catalog_seconds,
+            **report.stats.as_dict(),
+            "files": len(files),
+            "bytes": sum(path.stat().st_size for path in files),
+            # Kilobytes on Linux
+            "peak_memory_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        }
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument(
+        "--profile", choices=[profile.value for profile in JsonProfile], default="pretty"
+    )
+    parser.add_argument(
+        "--output", type=pathlib.Path, default=pathlib.Path("benchmark_results.json")
+    )
+    args = parser.parse_args()
+
+    runs = []
+    # A new process per size, so one runs memory doesn't count towards the next.
+    # Not a multiprocessing.Pool, its workers are daemonic and couldn't start the construct processes
+    context = multiprocessing.get_context("spawn")
+    for size in args.sizes:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            result = executor.submit(
+                run, size, args.workers, args.processes, args.profile
+            ).result()
+        runs.append(result)
+        phases = ", ".join(
+            f"{phase} {seconds:.2f}s" for phase, seconds in result["phase_seconds"].items()
+        )
+        print(
+            f"{size:>7}: generate {result['seconds']:.2f}s ({phases}), "
+            f"{result['files']} files, {result['bytes'] / 1e6:.1f} MB, "
+            f"peak {result['peak_memory_kb'] / 1024:.0f} MB"
+        )
+
+    args.output.write_text(
+        json.dumps(
+            {
+                "date": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                "commit": git_commit(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "runs": runs,
+            },
+            indent=4,
+        ),
+        encoding="utf-8",
+    )
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Memory used per Item/Block/Entity/recipe object, slotted (how they are now) vs a dict backed copy of the same class
+
+Run from the repository root: python -m benchmarks.memory [count]
+"""
+import sys
+import tracemalloc
+from src.item import Item
+from src.block import Block
+from src.entity import Entity
+from src.recipe import CraftingRecipeShaped, CraftingRecipeShapeless, RecipeIngredient
+
+
+def dict_backed(cls: type) -> type:
+    """
+    Returns a copy of the class without __slots__, like the classes were before
+    """
+    namespace = {
+        key: value
+        for key, value in cls.__dict__.items()
+        if key not in ("__slots__", "__dict__", "__weakref__", *cls.__slots__)
+    }
+    return type(f"DictBacked{cls.__name__}", cls.__bases__, namespace)
+
+
+def bytes_per_object(factory, count: int) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [factory(index) for index in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return (after - before) / count
+
+
+def build(cls: type, index: int):
+    if cls.__name__.endswith("RecipeIngredient"):
+        return cls(item_id="minecraft:leather", count=index % 64 + 1)
+    if hasattr(cls, "set_display_name"):
+        return cls().set_id(f"object_{index}").set_display_name(f"Object {index}")
+    if hasattr(cls, "set_name"):
+        return cls().set_id(f"object_{index}").set_name(f"Object {index}")
+    return cls().set_item_id(f"object_{index}").set_result_item_id(f"object_{index}")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    print(f"{'class':<24}{'dict (B)':>10}{'slots (B)':>11}{'saved':>8}")
+    for cls in (
+        Item,
+        Block,
+        Entity,
+        RecipeIngredient,
+        CraftingRecipeShaped,
+        CraftingRecipeShapeless,
+    ):
+        slotted = bytes_per_object(lambda index: build(cls, index), count)
+        unslotted_cls = dict_backed(cls)
+        unslotted = bytes_per_object(lambda index: build(unslotted_cls, index), count)
+        print(
+            f"{cls.__name__:<24}{unslotted:>10.0f}{slotted:>11.0f}"
+            f"{1 - slotted / unslotted:>8.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
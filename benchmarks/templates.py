@@ -0,0 +1,45 @@
+"""
+Items/blocks encoded per second, json.dumps(construct()) vs the precompiled templates (the output is checked to be the same)
+
+Run from the repository root: python -m benchmarks.templates [count]
+"""
+import json
+import sys
+import time
+from src.item import Item
+from src.block import Block
+from src.templates import TemplateCache
+
+NAMESPACE = "benchmark"
+
+
+def build(cls: type, index: int):
+    content = cls().set_id(f"object_{index}").set_display_name(f"Object {index}")
+    if cls is Item and index % 2:
+        content.set_food(index % 10)
+    return content
+
+
+def objects_per_second(encode, objects: list) -> tuple[float, list[str]]:
+    start = time.perf_counter()
+    encoded = [encode(content) for content in objects]
+    return len(objects) / (time.perf_counter() - start), encoded
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    print(f"{'class':<8}{'json.dumps (/s)':>17}{'template (/s)':>15}{'speedup':>9}")
+    for cls in (Item, Block):
+        objects = [build(cls, index) for index in range(count)]
+        dumps, expected = objects_per_second(
+            lambda content: json.dumps(content.construct(NAMESPACE), indent=4), objects
+        )
+        templates = TemplateCache(NAMESPACE)
+        template, encoded = objects_per_second(templates.encode, objects)
+        if encoded != expected:
+            raise SystemExit(f"{cls.__name__} templates don't match json.dumps")
+        print(f"{cls.__name__:<8}{dumps:>17.0f}{template:>15.0f}{template / dumps:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
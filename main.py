@@ -1,10 +1,31 @@
 import json
+import pathlib
+import sys
 from src.addon_manager import AddonManager
 from src.creative_category import CreativeCategory
 from src.item import Item
 from src.block import Block
 from src.recipe import CraftingRecipeShapeless, RecipeIngredient
-from src.util import error, OUT_DIRECTORY, DEFAULTS_PATH
+from src.json_profile import JsonProfile
+from src.util import error, configure_logging, AddonError, OUT_DIRECTORY, DEFAULTS_PATH
+from src.watch import Watcher, WatchUpdate
+
+def print_watch_update(update: WatchUpdate):
+    """
+    Print what a rebuild in watch mode did and how long it took
+    """
+    for row_error in update.row_errors:
+        print(f"ERROR: {row_error}")
+    for path, err in update.load_errors.items():
+        print(f"ERROR: couldn't load '{path}': {err}")
+    if update.error is not None:
+        print(f"ERROR: {update.error}")
+        return
+    print(
+        f"{', '.join(path.name for path in update.paths)} changed: rebuilt {len(update.content_ids)} "
+        f"definitions, wrote {len(update.report.written)} and deleted {len(update.report.deleted)} "
+        f"files in {update.seconds * 1000:.0f} ms"
+    )
 
 def main():
     if not OUT_DIRECTORY.exists():
@@ -14,13 +35,21 @@ def main():
     if not OUT_DIRECTORY.is_dir():
         error("'./out' must be a directory!")
 
-    input(
-        "WARNING: If you continue, any files in './out' will be erased! (Enter to continue)"
-    )
-
     name = "Template Addon"
     description = "A bedrock addon created using sammwi's AddonManager!"
     namespace = "template_addon"
+    incremental = False
+    deterministic = False
+    workers = 1
+    processes = 1
+    profile = "pretty"
+    catalogs = []
+    # "debug" shows every added item/lang key, quiet only shows errors, structured logs are json lines
+    log_level = "info"
+    quiet = False
+    structured_logs = False
+    # Keep running and rebuild whenever a catalog or texture image changes
+    watch = False
 
     if not DEFAULTS_PATH.exists() and not DEFAULTS_PATH.suffix == ".json":
         print(
@@ -32,8 +61,36 @@ def main():
         name = parsed.get("name", name)
         description = parsed.get("description", description)
         namespace = parsed.get("namespace", namespace)
+        incremental = parsed.get("incremental", incremental)
+        deterministic = parsed.get("deterministic", deterministic)
+        workers = parsed.get("workers", workers)
+        processes = parsed.get("processes", processes)
+        profile = parsed.get("profile", profile)
+        catalogs = parsed.get("catalogs", catalogs)
+        log_level = parsed.get("log_level", log_level)
+        quiet = parsed.get("quiet", quiet)
+        structured_logs = parsed.get("structured_logs", structured_logs)
+        watch = parsed.get("watch", watch)
+
+    configure_logging(log_level, quiet=quiet, structured=structured_logs)
 
-    manager = AddonManager(name, description, namespace)
+    # Watch mode keeps building into the same out folder, so it never erases it
+    incremental = incremental or watch
+    if not incremental:
+        input(
+            "WARNING: If you continue, any files in './out' will be erased! (Enter to continue)"
+        )
+
+    manager = AddonManager(
+        name,
+        description,
+        namespace,
+        incremental=incremental,
+        deterministic=deterministic,
+        workers=workers,
+        processes=processes,
+        profile=JsonProfile(profile),
+    )
 
     manager.add_item(
         item=Item()
@@ -85,9 +142,32 @@ def main():
         )
     )
 
-    manager.generate()
-    print("\nFinished!")
+    # .jsonl/.csv files with more items, blocks, entities and recipes
+    watcher = Watcher(manager) if watch else None
+    for catalog in catalogs:
+        load_catalog = manager.load_catalog if watcher is None else watcher.load_catalog
+        load_report = load_catalog(pathlib.Path(catalog))
+        print(f"Loaded {load_report.loaded} definitions from '{catalog}'")
+        for row_error in load_report.errors:
+            print(f"ERROR: {row_error}")
+
+    report = manager.generate()
+    print(
+        f"\nFinished! Wrote {len(report.written)}, skipped {len(report.skipped)} "
+        f"unchanged and deleted {len(report.deleted)} stale files in {report.stats.seconds:.2f}s"
+    )
+
+    if watcher is not None:
+        print("\nWatching the catalogs and textures for changes (Ctrl+C to stop)...")
+        try:
+            watcher.run(print_watch_update)
+        except KeyboardInterrupt:
+            print("Stopped watching")
 
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    except AddonError as err:
+        print(f"ERROR: {err}")
+        sys.exit(1)
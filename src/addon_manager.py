@@ -1,10 +1,35 @@
 import pathlib
+from typing import Callable, Iterable, Mapping
 import json
 import uuid
-import shutil
+import hashlib
+import functools
+import contextlib
+import threading
+import asyncio
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 # If you have a linter/pylint, it will show these as errors but it works and I don't know how to remove the error
-from .util import error, debug, OUT_DIRECTORY 
-from .constants import FORMAT_VERSION, FORMAT_VERSION_BLOCK_SOUND, MIN_ENGINE_VERSION, GLOBAL_VERSION 
+from .util import error, debug, info, BuildCancelled
+from .lang import LangTable, DEFAULT_LANGUAGE
+from .atlas import AtlasRegistry
+from .build_index import BuildIndex, BuildReport
+from .build_stats import BuildStats
+from .output import OutputSink, FileSystemSink
+from .pack_version import manifest_uuid
+from .construct_pool import ConstructPool
+from .json_profile import JsonProfile, encode_json
+from .templates import encode_construct
+from .textures import TextureStore, is_source_image
+from .texture_generator import TextureGenerator
+from .loader import LoadReport, load_catalog
+from .registry import ContentRegistry
+from .recipe_graph import RecipeGraph, on_recipe_set
+from .recipe_compiler import recipe_fingerprint
+from .validation import ValidationReport, validate_addon
+from .tables import ItemTable, BlockTable
+from .vanilla import VanillaCatalog
+from .constants import FORMAT_VERSION, MIN_ENGINE_VERSION, GLOBAL_VERSION 
 from .item import Item
 from .block import Block
 from .entity import Entity
@@ -17,10 +42,61 @@ class AddonManager:
     """
 
     def __init__(
-        self, name: str, description: str, namespace: str | None = None
+        self,
+        name: str,
+        description: str,
+        namespace: str | None = None,
+        incremental: bool = False,
+        deterministic: bool = False,
+        workers: int = 1,
+        processes: int = 1,
+        chunk_size: int = 1000,
+        sink: OutputSink | None = None,
+        profile: JsonProfile = JsonProfile.PRETTY,
+        on_phase: Callable[[str, str, BuildStats], object] | None = None,
+        texture_generator: TextureGenerator | None = None,
+        validate_first: bool = True,
+        vanilla: VanillaCatalog | None = None,
+        allow_unknown_vanilla: bool = False,
     ) -> None:
-        self.main_directory = OUT_DIRECTORY
-        self.clean()
+        # Where the files go, the out folder by default (see output.py and archive.py for the others)
+        self.sink = FileSystemSink() if sink is None else sink
+        self.main_directory = self.sink.directory
+        # Incremental builds keep the out folder and only rewrite files whose content changed
+        self.incremental = incremental
+        if not self.incremental:
+            self.clean()
+        self.build_index = BuildIndex(self.sink, incremental=self.incremental)
+        # Deterministic builds derive manifest uuids from the namespace and only bump
+        # the version when the pack contents change, so identical inputs give identical packs
+        self.deterministic = deterministic
+        # Number of threads writing the per object files (items, blocks, recipes, entities), 1 writes them in order
+        self.workers = workers
+        self.__executor: ThreadPoolExecutor | None = None
+        self.__pending: list[Future] = []
+        self.__in_flight: threading.BoundedSemaphore | None = None
+        # Set when generate_async() is cancelled, the build stops at the next file
+        self.__cancelled = threading.Event()
+        # Number of processes building and encoding the json of big object lists, in chunks of chunk_size.
+        # Lists no bigger than one chunk are always built in this process
+        self.processes = processes
+        self.chunk_size = chunk_size
+        # How every json file (manifests, atlases, items...) is written: pretty, compact or fast (see json_profile.py)
+        self.profile = JsonProfile(profile)
+        self.__construct_pool = ConstructPool(
+            self.processes, self.chunk_size, self.profile
+        )
+        # Called as on_phase(phase, "start" or "end", stats) around every phase of generate() (see build_stats.py),
+        # e.g. to send the timings to a metrics service
+        self.on_phase = on_phase
+        # Check every definition before a build writes anything, a build with problems fails
+        # with all of them instead of the first one halfway through (see validation.py)
+        self.validate_first = validate_first
+        # The vanilla ids "minecraft:" references are checked against, the bundled ones by default
+        # (pass VanillaCatalog.read(path) for a newer Minecraft version). Unknown vanilla ids are
+        # validation problems, or only logged as warnings with allow_unknown_vanilla
+        self.vanilla = vanilla
+        self.allow_unknown_vanilla = allow_unknown_vanilla
 
         self.name = name
         self.namespace = (
@@ -29,10 +105,10 @@ class AddonManager:
         self.description = description
 
         self.behaviour_path = self.__ensure_file_or_folder_exists(
-            path=OUT_DIRECTORY.joinpath(f"{self.namespace}_behaviour"), is_folder=True
+            path=self.main_directory.joinpath(f"{self.namespace}_behaviour"), is_folder=True
         )
         self.resource_path = self.__ensure_file_or_folder_exists(
-            path=OUT_DIRECTORY.joinpath(f"{self.namespace}_resources"), is_folder=True
+            path=self.main_directory.joinpath(f"{self.namespace}_resources"), is_folder=True
         )
 
         self.items_behaviour_path = self.__ensure_file_or_folder_exists(
@@ -62,13 +138,35 @@ class AddonManager:
             path=self.resource_path.joinpath("entity"), is_folder=True
         )
 
-        self.items: list[Item] = []
-        self.blocks: list[Block] = []
+        # Items, blocks and entities by their namespaced identifier
+        self.registry = ContentRegistry(self.namespace)
         self.recipes: list[CraftingRecipeShapeless | CraftingRecipeShaped] = []
-        self.entities: list[Entity] = []
+        self.__recipe_graph = RecipeGraph(self.registry.identifier)
+        # Identifier -> the recipe of that item/block that is in the recipe graph
+        self.__content_recipes: dict[str, CraftingRecipeShapeless | CraftingRecipeShaped] = {}
+        # Registered items/blocks that were given a recipe since the graph was last returned
+        self.__recipes_set: dict[str, Item | Block] = {}
+        on_recipe_set(self.__on_recipe_set)
+        # Fingerprint -> id of the recipe written for it this build, equivalent recipes are only written once
+        self.__recipe_fingerprints: dict[str, str] = {}
+        # Identifiers whose per object files a partial build (see regenerate()) writes, None in full builds
+        self.__changed: set[str] | None = None
         self.biomes: list[Biome] = []
 
-        self.initalize()
+        # Keys added with add_translation(), every build starts its lang table from these
+        self.custom_lang = LangTable()
+        self.lang = LangTable()
+        self.atlases = AtlasRegistry()
+        # Source images of items/blocks, copied into the resource pack once per distinct image
+        self.textures = TextureStore()
+        # Makes placeholder textures for the items/blocks without a texture path (needs NumPy)
+        self.texture_generator = texture_generator
+
+    def __name(self, path: pathlib.Path) -> str:
+        """
+        The name of a path inside the out folder, used by the output sink
+        """
+        return path.relative_to(self.main_directory).as_posix()
 
     def __ensure_file_or_folder_exists(
         self, path: pathlib.Path, is_folder: bool = False
@@ -76,37 +174,130 @@ class AddonManager:
         """
         Checks if the path exists, if not it creates it and its parents
         """
-        if not path.exists():
-            if is_folder:
-                path.mkdir(parents=True)
-            else:
-                path.touch()
+        if is_folder:
+            self.sink.make_folder(self.__name(path))
+        elif not self.sink.exists(self.__name(path)):
+            self.sink.write(self.__name(path), b"")
         return path
 
-    def __setup_behaviour_manifest(self, resource_manifest) -> dict:
+    def __write_file(self, path: pathlib.Path, text: str | bytes, atomic: bool = False):
+        """
+        Write a file into the addon, unchanged files from the last build are skipped
+        """
+        self.build_index.write(self.__name(path), text, atomic=atomic)
+
+    def __write_object_file(self, path: pathlib.Path, text: str):
+        """
+        Write a per object file, on the thread pool while generate() is emitting in parallel
+        """
+        self.__check_cancelled()
+        in_flight = self.__in_flight
+        if self.__executor is None or in_flight is None:
+            self.__write_file(path, text)
+            return
+        # Bound the queued files so a huge catalog isn't held in memory all at once
+        in_flight.acquire()
+        future = self.__executor.submit(self.__write_file, path, text)
+        future.add_done_callback(lambda _: in_flight.release())
+        self.__pending.append(future)
+
+    def __emit_object_file(
+        self, path: pathlib.Path, text: str | None, encode: Callable[[], str]
+    ):
+        """
+        Write a per object file, text is None for the objects a partial build didn't change:
+        their file of the last build is kept (or encoded again if there isn't one)
+        """
+        if text is None:
+            if self.build_index.keep(self.__name(path)):
+                return
+            text = self.__timed_encode(encode)
+        self.__write_object_file(path, text)
+
+    def __is_changed(self, content_id: str) -> bool:
+        """
+        If the files of an item/block/entity/recipe get written this build (always true outside partial builds)
+        """
+        return self.__changed is None or self.registry.identifier(content_id) in self.__changed
+
+    def __check_cancelled(self):
+        if self.__cancelled.is_set():
+            raise BuildCancelled("The build was cancelled")
+
+    @contextlib.contextmanager
+    def __emission_stage(self, workers: int):
+        """
+        Per object files written inside this block go through a bounded thread pool,
+        all of them are written (or the first error is raised) when it exits.
+        Worker processes started for encoding are stopped too
+        """
+        if workers <= 1:
+            try:
+                yield
+            finally:
+                self.__construct_pool.close()
+            return
+        self.__in_flight = threading.BoundedSemaphore(workers * 4)
+        self.__executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="addon-writer"
+        )
+        try:
+            yield
+        finally:
+            self.__construct_pool.close()
+            self.__executor.shutdown(wait=True)
+            pending = self.__pending
+            self.__executor = None
+            self.__in_flight = None
+            self.__pending = []
+        for future in pending:
+            future.result()
+
+    def __manifest_uuid(self, pack: str, part: str) -> str:
+        """
+        Random uuid for normal builds, namespace derived uuid for deterministic builds
+        """
+        if self.deterministic:
+            return manifest_uuid(self.namespace, pack, part)
+        return str(uuid.uuid4())
+
+    def __pack_version(self) -> list[int]:
+        """
+        The version used in both manifests, deterministic builds bump it when the pack contents change
+        """
+        if not self.deterministic:
+            return GLOBAL_VERSION
+        manifest_names = {
+            self.__name(self.behaviour_path.joinpath("manifest.json")),
+            self.__name(self.resource_path.joinpath("manifest.json")),
+        }
+        content_hash = self.build_index.content_hash(exclude=manifest_names)
+        header = json.dumps([self.name, self.description, self.namespace])
+        content_hash = hashlib.sha256(f"{header}{content_hash}".encode("utf-8")).hexdigest()
+        return self.sink.pack_versions().version_for(self.namespace, content_hash)
+
+    def __setup_behaviour_manifest(self, resource_manifest, version: list[int]) -> dict:
         """
         Create and put the behaviour pack manifest into the addon
         """
         debug("Setting up behaviour manifest")
 
-        manifest_path = self.__ensure_file_or_folder_exists(
-            path=self.behaviour_path.joinpath("manifest.json")
-        )
+        manifest_path = self.behaviour_path.joinpath("manifest.json")
         manifest = {
             "format_version": FORMAT_VERSION,
             "header": {
                 "name": f"{self.name} Behaviour",
                 "description": self.description,
-                "uuid": str(uuid.uuid4()),
-                "version": GLOBAL_VERSION,
+                "uuid": self.__manifest_uuid("behaviour", "header"),
+                "version": version,
                 "min_engine_version": MIN_ENGINE_VERSION,
             },
             "modules": [
                 {
                     "description": self.description,
                     "type": "data",
-                    "uuid": str(uuid.uuid4()),
-                    "version": GLOBAL_VERSION,
+                    "uuid": self.__manifest_uuid("behaviour", "module"),
+                    "version": version,
                 }
             ],
             "dependencies": [
@@ -117,156 +308,166 @@ class AddonManager:
             ],
         }
 
-        manifest_path.write_text(json.dumps(manifest, indent=4))
+        self.__write_file(manifest_path, self.__timed_encode(encode_json, manifest, self.profile))
         return manifest
 
-    def __setup_resources_manifest(self) -> dict:
+    def __setup_resources_manifest(self, version: list[int]) -> dict:
         """
         Create and put the resource pack manifest into the addon
         """
         debug("Setting up resources manifest")
 
-        manifest_path = self.__ensure_file_or_folder_exists(
-            path=self.resource_path.joinpath("manifest.json")
-        )
+        manifest_path = self.resource_path.joinpath("manifest.json")
         manifest = {
             "format_version": FORMAT_VERSION,
             "header": {
                 "name": f"{self.name} Resources",
                 "description": self.description,
-                "uuid": str(uuid.uuid4()),
-                "version": GLOBAL_VERSION,
+                "uuid": self.__manifest_uuid("resources", "header"),
+                "version": version,
                 "min_engine_version": MIN_ENGINE_VERSION,
             },
             "modules": [
                 {
                     "description": self.description,
                     "type": "resources",
-                    "uuid": str(uuid.uuid4()),
-                    "version": GLOBAL_VERSION,
+                    "uuid": self.__manifest_uuid("resources", "module"),
+                    "version": version,
                 }
             ],
         }
 
-        manifest_path.write_text(json.dumps(manifest, indent=4))
+        self.__write_file(manifest_path, self.__timed_encode(encode_json, manifest, self.profile))
         return manifest
 
     def clean(self):
         """
-        reset/clear the contents in the out folder
+        reset/clear the contents in the out folder (or whatever the output sink holds)
         """
-        shutil.rmtree(self.main_directory)
-        self.main_directory.mkdir()
+        self.sink.clean()
 
-    def __write_to_lang(self, key: str, value: str):
+    def __write_to_lang(self, key: str, value: str, language: str = DEFAULT_LANGUAGE):
         """
-        Write the item (id) display name to texts/(language).json
+        Add the item (id) display name to the lang table, it gets written to texts/(language).lang by generate()
         """
-        # TODO: other languages?
-        default_lang = "en_US"
-        debug(f"Writing '{key}' to language {default_lang} with value '{value}'")
-        lang_path = self.__ensure_file_or_folder_exists(
-            path=self.resource_path.joinpath("texts"), is_folder=True
-        )
-        lang_file_path = self.__ensure_file_or_folder_exists(
-            path=lang_path.joinpath(f"{default_lang}.lang")
+        self.lang.add(key, value, language)
+
+    def __write_translations(self, key: str, translations: Mapping[str, str]):
+        """
+        Add every non default language display name of an item/block to the lang table
+        """
+        for language, value in translations.items():
+            self.__write_to_lang(key=key, value=value, language=language)
+
+    def __write_lang(self):
+        """
+        Write all collected lang keys to texts/(language).lang and texts/languages.json
+        """
+        debug("Writing languages %s", ", ".join(self.lang.languages))
+        self.lang.write(
+            self.resource_path.joinpath("texts"),
+            write_file=self.__write_file,
+            profile=self.profile,
         )
-        lang_text = lang_file_path.read_text().lstrip()
-        lang_file_path.write_text(f"{lang_text}\n{key}={value}")
+
+    def add_translation(self, key: str, value: str, language: str = DEFAULT_LANGUAGE):
+        """
+        Add a custom lang key to the addon (e.g. for languages other than English)
+        """
+        self.custom_lang.add(key, value, language)
 
     def __write_item_texture(self, item: Item):
         """
-        Write the item (item.id) texture to textures/item_texture.json
+        Add the item (item.id) texture to textures/item_texture.json
         """
-        item_textures_json_path = self.__ensure_file_or_folder_exists(
-            path=self.resource_path.joinpath("textures/item_texture.json")
+        texture = (
+            f"textures/items/{item.id}" if item.texture_path is None else item.texture_path
         )
-        name = f"{self.namespace}:{item.id}"
-        try:
-            parsed = json.loads(item_textures_json_path.read_text())
-            parsed["texture_data"][name] = {
-                "textures": f"textures/items/{item.id}"
-                if item.texture_path is None
-                else item.texture_path
-            }
-            item_textures_json_path.write_text(json.dumps(parsed, indent=4))
-        except:
-            item_textures_json_path.write_text(
-                json.dumps(
-                    {
-                        "texture_name": "atlas.items",
-                        "texture_data": {
-                            name: {
-                                "textures": f"textures/items/{item.id}"
-                                if item.texture_path is None
-                                else item.texture_path
-                            }
-                        },
-                    },
-                    indent=4,
-                )
-            )
-        debug(f"Make sure to provide the texture for item with id '{item.id}'")
+        if is_source_image(texture):
+            texture = self.textures.add("items", texture)
+        elif item.texture_path is None and self.texture_generator is not None:
+            texture = self.textures.add_missing("items", item.id)
+        else:
+            debug("Make sure to provide the texture for item with id '%s'", item.id)
+        self.atlases.add_item_texture(name=f"{self.namespace}:{item.id}", texture=texture)
 
     def __write_block_sound(self, block: Block):
-        blocks_resource_sounds_json_path = self.__ensure_file_or_folder_exists(
-            path=self.resource_path.joinpath("blocks.json")
+        """
+        Add the block (block.id) sound to blocks.json
+        """
+        self.atlases.add_block_sound(
+            name=f"{self.namespace}:{block.id}", sound=block.sound.value
         )
-        name = f"{self.namespace}:{block.id}"
-        try:
-            parsed = json.loads(blocks_resource_sounds_json_path.read_text())
-            parsed[name] = {"sound": block.sound.value, "textures": name}
-            blocks_resource_sounds_json_path.write_text(json.dumps(parsed, indent=4))
-        except:
-            data = {
-                "format_version": FORMAT_VERSION_BLOCK_SOUND,
-                name: {"sound": block.sound.value, "textures": name},
-            }
-            blocks_resource_sounds_json_path.write_text(json.dumps(data, indent=4))
 
     def __write_block_texture(self, block: Block):
         """
-        Write the block (block.id) texture to textures/terrain_texture.json
+        Add the block (block.id) texture to textures/terrain_texture.json
         """
-        block_textures_json_path = self.__ensure_file_or_folder_exists(
-            path=self.resource_path.joinpath("textures/terrain_texture.json")
+        texture = (
+            f"textures/blocks/{block.id}" if block.texture_path is None else block.texture_path
         )
-        name = f"{self.namespace}:{block.id}"
-        try:
-            parsed = json.loads(block_textures_json_path.read_text())
-            parsed["texture_data"][name] = {
-                "textures": f"textures/blocks/{block.id}"
-                if block.texture_path is None
-                else block.texture_path
-            }
-            block_textures_json_path.write_text(json.dumps(parsed, indent=4))
-        except:
-            block_textures_json_path.write_text(
-                json.dumps(
-                    {
-                        "texture_name": "atlas.terrain",
-                        "padding": 8,
-                        "num_mip_levels": 4,
-                        "texture_data": {
-                            name: {
-                                "textures": f"textures/blocks/{block.id}"
-                                if block.texture_path is None
-                                else block.texture_path
-                            }
-                        },
-                    },
-                    indent=4,
-                )
+        if is_source_image(texture):
+            texture = self.textures.add("blocks", texture)
+        elif block.texture_path is None and self.texture_generator is not None:
+            texture = self.textures.add_missing("blocks", block.id)
+        else:
+            debug("Make sure to provide the texture for block with id '%s'", block.id)
+        self.atlases.add_block_texture(
+            name=f"{self.namespace}:{block.id}", texture=texture
+        )
+
+    def __write_textures(self):
+        """
+        Copy the source images of the items/blocks into the resource pack (linked when the sink can)
+        and generate the textures of the ones without a texture
+        """
+        debug("Copying %d textures", len(self.textures.files))
+        for texture, (source, digest) in self.textures.files.items():
+            self.__check_cancelled()
+            self.build_index.copy(
+                self.__name(self.resource_path.joinpath(texture)), source, digest
             )
-        debug(f"Make sure to provide the texture for block with id '{block.id}'")
+        if self.texture_generator is None:
+            return
+        for folder, ids in self.textures.missing.items():
+            if self.__changed is not None:
+                # Generated textures only depend on the id, partial builds keep the ones they already made
+                textures = self.resource_path.joinpath("textures", folder)
+                ids = [
+                    content_id
+                    for content_id in ids
+                    if not self.build_index.keep(
+                        self.__name(textures.joinpath(f"{content_id}.png"))
+                    )
+                ]
+            debug("Generating %d %s textures", len(ids), folder)
+            # One batch per folder
+            images = self.texture_generator.generate(ids)
+            for content_id, image in zip(ids, images):
+                self.__check_cancelled()
+                self.__write_file(
+                    self.resource_path.joinpath(f"textures/{folder}/{content_id}.png"), image
+                )
+
+    def __write_atlases(self):
+        """
+        Write the collected texture atlases and block sounds into the resource pack
+        """
+        debug("Writing texture atlases and block sounds")
+        self.atlases.write(
+            self.resource_path,
+            write_file=functools.partial(self.__write_file, atomic=True),
+            profile=self.profile,
+        )
 
     def add_item(self, item: Item):
         """
         Add a custom item to the addon using the Item class
         """
-        debug(f"Adding item with id '{item.id}'")
-        index = len(self.items)
-        self.items.append(item)
+        debug("Adding item with id '%s'", item.id)
+        index = len(self.registry.items)
+        self.registry.add(item)
+        self.__add_to_recipe_graph(item)
         return index
 
     def add_items(self, items: list[Item]):
@@ -275,15 +476,16 @@ class AddonManager:
         """
         for item in items:
             self.add_item(item)
-        return len(self.items)
+        return len(self.registry.items)
 
     def add_block(self, block: Block):
         """
         Add a custom block to the addon using the Block class
         """
-        debug(f"Adding block with id '{block.id}'")
-        index = len(self.blocks)
-        self.blocks.append(block)
+        debug("Adding block with id '%s'", block.id)
+        index = len(self.registry.blocks)
+        self.registry.add(block)
+        self.__add_to_recipe_graph(block)
         return index
 
     def add_blocks(self, blocks: list[Block]):
@@ -292,98 +494,329 @@ class AddonManager:
         """
         for block in blocks:
             self.add_block(block)
-        return len(self.blocks)
+        return len(self.registry.blocks)
+
+    def add_item_table(self, table: ItemTable):
+        """
+        Add a table of items (for huge catalogs of simple items), add it once it's filled
+        since its ids are checked for collisions now
+        """
+        debug("Adding item table with %d rows", len(table))
+        return self.registry.add_table(table)
+
+    def add_block_table(self, table: BlockTable):
+        """
+        Add a table of blocks (for huge catalogs of simple blocks), add it once it's filled
+        since its ids are checked for collisions now
+        """
+        debug("Adding block table with %d rows", len(table))
+        return self.registry.add_table(table)
 
     def add_recipe(self, recipe: CraftingRecipeShapeless | CraftingRecipeShaped):
         """
         Add a custom recipe to the addon using the Recipe class
         """
-        debug(f"Adding recipe for item/block with id '{recipe.result_item_id}'")
+        debug("Adding recipe for item/block with id '%s'", recipe.result_item_id)
         index = len(self.recipes)
         self.recipes.append(recipe)
+        self.__recipe_graph.add(recipe)
         return index
 
+    def remove_recipe(self, recipe: CraftingRecipeShapeless | CraftingRecipeShaped):
+        """
+        Remove a recipe that was added with add_recipe
+        """
+        debug("Removing recipe for item/block with id '%s'", recipe.result_item_id)
+        self.recipes = [added for added in self.recipes if added is not recipe]
+        self.__recipe_graph.remove(recipe)
+
+    def load_catalog(self, path: pathlib.Path) -> LoadReport:
+        """
+        Add every item, block, entity and recipe of a .jsonl/.csv file, row by row.
+        Rows that can't be loaded are returned as errors with their line number
+        """
+        info("Loading catalog '%s'", path)
+        return load_catalog(self, path)
+
     def add_entity(self, entity: Entity):
         """
         Add a custom entity to the addon using the Entity class
         """
-        debug(f"Adding entity with id '{entity.id}'")
-        index = len(self.entities)
-        self.entities.append(entity)
+        debug("Adding entity with id '%s'", entity.id)
+        index = len(self.registry.entities)
+        self.registry.add(entity)
         return index
 
+    def get(self, content_id: str) -> Item | Block | Entity | None:
+        """
+        Returns the item/block/entity with the id ("id" or "namespace:id"), or None
+        """
+        return self.registry.get(content_id)
+
+    def remove(self, content_id: str) -> Item | Block | Entity:
+        """
+        Remove the item/block/entity with the id ("id" or "namespace:id") from the addon and return it
+        """
+        debug("Removing '%s'", content_id)
+        content = self.registry.remove(content_id)
+        self.__remove_from_recipe_graph(content)
+        return content
+
+    def replace(self, content: Item | Block | Entity) -> Item | Block | Entity | None:
+        """
+        Put an item/block/entity in place of the one with the same id, returns the replaced one (or None)
+        """
+        debug("Replacing '%s'", content.id)
+        existing = self.registry.replace(content)
+        self.__remove_from_recipe_graph(existing)
+        self.__add_to_recipe_graph(content)
+        return existing
+
+    @property
+    def recipe_graph(self) -> RecipeGraph:
+        """
+        Every recipe (added ones and the ones of items/blocks) by what it uses and makes.
+        Recipes set on items/blocks after they were added are picked up here
+        """
+        recipes_set, self.__recipes_set = self.__recipes_set, {}
+        for identifier, content in recipes_set.items():
+            # It may have been removed or replaced since
+            if self.registry.content.get(identifier) is content:
+                self.__remove_from_recipe_graph(content)
+                self.__add_to_recipe_graph(content)
+        return self.__recipe_graph
+
+    def __on_recipe_set(self, content: Item | Block):
+        identifier = self.registry.identifier(content.id)
+        if self.registry.content.get(identifier) is content:
+            self.__recipes_set[identifier] = content
+
+    def __add_to_recipe_graph(self, content: Item | Block | Entity):
+        recipe = getattr(content, "recipe", None)
+        if recipe is not None:
+            self.__recipe_graph.add(recipe)
+            self.__content_recipes[self.registry.identifier(content.id)] = recipe
+
+    def __remove_from_recipe_graph(self, content: Item | Block | Entity | None):
+        # The recipe it was added with, it may have been given another one since
+        recipe = (
+            None
+            if content is None
+            else self.__content_recipes.pop(self.registry.identifier(content.id), None)
+        )
+        if recipe is not None:
+            self.__recipe_graph.remove(recipe)
+
+    def validate(self) -> ValidationReport:
+        """
+        Returns every problem with the items, blocks, entities, recipes and lang keys
+        (bad ids, recipes using unknown items, values out of range...) without writing anything
+        """
+        report = validate_addon(self)
+        debug("Validated the addon: %r", report)
+        return report
+
+    @property
+    def items(self) -> list[Item]:
+        """
+        The custom items in the order they were added (use add_item/remove/replace to change them)
+        """
+        return list(self.registry.items.values())
+
+    @property
+    def blocks(self) -> list[Block]:
+        """
+        The custom blocks in the order they were added (use add_block/remove/replace to change them)
+        """
+        return list(self.registry.blocks.values())
+
+    @property
+    def entities(self) -> list[Entity]:
+        """
+        The custom entities in the order they were added (use add_entity/remove/replace to change them)
+        """
+        return list(self.registry.entities.values())
+
     def __real_initalize(self):
-        rp_manifest = self.__setup_resources_manifest()
-        self.__setup_behaviour_manifest(rp_manifest)
-        debug("Finished initalizing\n")
+        version = self.__pack_version()
+        rp_manifest = self.__setup_resources_manifest(version)
+        self.__setup_behaviour_manifest(rp_manifest, version)
+        debug("Finished initalizing")
 
     def initalize(self):
         """
-        Initalize Addon Manager
+        Write the pack manifests, generate() calls this once the pack contents are written
         """
         try:
             self.__real_initalize()
         except Exception as err:
             error(f"Failed to initalize AddonManager: {err}")
 
+    def __encode(self, objects: list, *methods: str):
+        """
+        Yields the json of every construct method for every object, in order (in worker processes for big lists)
+        """
+        stats = self.build_index.report.stats
+        start = time.perf_counter()
+        for encoded in self.__construct_pool.encode(self.namespace, methods, objects):
+            stats.encode_seconds += time.perf_counter() - start
+            yield encoded
+            start = time.perf_counter()
+        stats.encode_seconds += time.perf_counter() - start
+
+    def __encode_changed(self, objects: list, content_ids: Iterable[str], *methods: str):
+        """
+        Like __encode, but partial builds only encode the changed objects and yield None for the others
+        """
+        if self.__changed is None:
+            yield from self.__encode(objects, *methods)
+            return
+        changed = [self.__is_changed(content_id) for content_id in content_ids]
+        encoded = self.__encode(
+            [obj for obj, is_changed in zip(objects, changed) if is_changed], *methods
+        )
+        for is_changed in changed:
+            yield next(encoded) if is_changed else (None,) * len(methods)
+
+    def __timed_encode(self, encode: Callable[..., str], *args) -> str:
+        """
+        Returns encode(*args) and adds the time it took to the builds encode time
+        """
+        start = time.perf_counter()
+        try:
+            return encode(*args)
+        finally:
+            self.build_index.report.stats.encode_seconds += time.perf_counter() - start
+
+    @contextlib.contextmanager
+    def __phase(self, phase: str):
+        """
+        Time a phase of generate() and call the on_phase hook when it starts and ends
+        """
+        stats = self.build_index.report.stats
+        if self.on_phase is not None:
+            self.on_phase(phase, "start", stats)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            stats.phase_seconds[phase] = time.perf_counter() - start
+        if self.on_phase is not None:
+            self.on_phase(phase, "end", stats)
+
     def __generate_recipe(
-        self, recipe: CraftingRecipeShaped | CraftingRecipeShapeless | None
+        self,
+        recipe: CraftingRecipeShaped | CraftingRecipeShapeless | None,
+        recipe_json: str | None = None,
     ):
         if recipe is None:
             return
-        recipe_json_path = self.__ensure_file_or_folder_exists(
-            path=self.behaviour_path.joinpath(f"recipes/{recipe.item_id}.json"),
-        )
-        recipe_json_path.write_text(
-            json.dumps(recipe.construct(self.namespace), indent=4)
+        fingerprint = recipe_fingerprint(recipe)
+        first = self.__recipe_fingerprints.setdefault(fingerprint, recipe.item_id)
+        if first != recipe.item_id:
+            debug("Skipping recipe '%s', it is the same as recipe '%s'", recipe.item_id, first)
+            return
+
+        def encode() -> str:
+            return encode_json(recipe.construct(self.namespace), self.profile)
+
+        if recipe_json is None and self.__is_changed(recipe.item_id):
+            recipe_json = self.__timed_encode(encode)
+        recipe_json_path = self.recipes_behaviour_path.joinpath(f"{recipe.item_id}.json")
+        self.__emit_object_file(recipe_json_path, recipe_json, encode)
+
+    def __generate_item(self, item: Item, item_json: str | None):
+        lang_key = f"item.{self.namespace}:{item.id}.name"
+        self.__write_to_lang(key=lang_key, value=item.display_name)
+        self.__write_translations(key=lang_key, translations=item.translations)
+        self.__write_item_texture(item)
+        self.__generate_recipe(item.recipe)
+        item_path = self.items_behaviour_path.joinpath(f"{item.id}.json")
+        self.__emit_object_file(
+            item_path, item_json, lambda: encode_construct(self.namespace, item, self.profile)
         )
 
     def __generate_items(self):
-        for item in self.items:
-            self.__write_to_lang(
-                key=f"item.{self.namespace}:{item.id}.name", value=item.display_name
-            )
-            self.__write_item_texture(item)
-            self.__generate_recipe(item.recipe)
-            item_path = self.__ensure_file_or_folder_exists(
-                path=self.items_behaviour_path.joinpath(f"{item.id}.json")
-            )
-            item_data = item.construct(self.namespace)
-            item_path.write_text(json.dumps(item_data, indent=4))
+        items = self.items
+        for item, (item_json,) in zip(
+            items, self.__encode_changed(items, [item.id for item in items], "construct")
+        ):
+            self.__generate_item(item, item_json)
+        for table in self.registry.item_tables:
+            # One reused Item for the whole table
+            for item in table.flyweights():
+                item_json = (
+                    self.__timed_encode(encode_construct, self.namespace, item, self.profile)
+                    if self.__is_changed(item.id)
+                    else None
+                )
+                self.__generate_item(item, item_json)
+
+    def __generate_block(self, block: Block, block_json: str | None):
+        lang_key = f"tile.{self.namespace}:{block.id}.name"
+        self.__write_to_lang(key=lang_key, value=block.display_name)
+        self.__write_translations(key=lang_key, translations=block.translations)
+        self.__write_block_texture(block)
+        self.__write_block_sound(block)
+        self.__generate_recipe(block.recipe)
+        block_path = self.blocks_behaviour_path.joinpath(f"{block.id}.json")
+        self.__emit_object_file(
+            block_path, block_json, lambda: encode_construct(self.namespace, block, self.profile)
+        )
 
     def __generate_blocks(self):
-        for block in self.blocks:
-            self.__write_to_lang(
-                key=f"tile.{self.namespace}:{block.id}.name", value=block.display_name
-            )
-            self.__write_block_texture(block)
-            self.__write_block_sound(block)
-            self.__generate_recipe(block.recipe)
-            block_path = self.__ensure_file_or_folder_exists(
-                path=self.blocks_behaviour_path.joinpath(f"{block.id}.json")
-            )
-            block_data = block.construct(self.namespace)
-            block_path.write_text(json.dumps(block_data, indent=4))
+        blocks = self.blocks
+        for block, (block_json,) in zip(
+            blocks, self.__encode_changed(blocks, [block.id for block in blocks], "construct")
+        ):
+            self.__generate_block(block, block_json)
+        for table in self.registry.block_tables:
+            # One reused Block for the whole table
+            for block in table.flyweights():
+                block_json = (
+                    self.__timed_encode(encode_construct, self.namespace, block, self.profile)
+                    if self.__is_changed(block.id)
+                    else None
+                )
+                self.__generate_block(block, block_json)
 
     def __generate_recipes(self):
-        for recipe in self.recipes:
-            self.__generate_recipe(recipe)
+        for recipe, (recipe_json,) in zip(
+            self.recipes,
+            self.__encode_changed(
+                self.recipes, [recipe.item_id for recipe in self.recipes], "construct"
+            ),
+        ):
+            self.__generate_recipe(recipe, recipe_json)
 
     def __generate_entities(self):
-        for entity in self.entities:
+        entities = self.entities
+        for entity, (entity_json_resource, entity_json_behaviour) in zip(
+            entities,
+            self.__encode_changed(
+                entities,
+                [entity.id for entity in entities],
+                "construct_resource",
+                "construct_behaviour",
+            ),
+        ):
             # For the resource pack
-            entity_path_resource = self.__ensure_file_or_folder_exists(
-                path=self.entities_resource_path.joinpath(f"{entity.id}.entity.json")
+            entity_path_resource = self.entities_resource_path.joinpath(
+                f"{entity.id}.entity.json"
+            )
+            self.__emit_object_file(
+                entity_path_resource,
+                entity_json_resource,
+                lambda: encode_json(entity.construct_resource(self.namespace), self.profile),
             )
-            entity_data_resource = entity.construct_resource(self.namespace)
-            entity_path_resource.write_text(json.dumps(entity_data_resource, indent=4))
             # For the behaviour pack
-            entity_path_behaviour = self.__ensure_file_or_folder_exists(
-                path=self.entities_behaviour_path.joinpath(f"{entity.id}.json")
+            entity_path_behaviour = self.entities_behaviour_path.joinpath(
+                f"{entity.id}.json"
             )
-            entity_data_behaviour = entity.construct_behaviour(self.namespace)
-            entity_path_behaviour.write_text(
-                json.dumps(entity_data_behaviour, indent=4)
+            self.__emit_object_file(
+                entity_path_behaviour,
+                entity_json_behaviour,
+                lambda: encode_json(entity.construct_behaviour(self.namespace), self.profile),
             )
             # Name the spawn egg
             self.__write_to_lang(
@@ -391,11 +824,110 @@ class AddonManager:
                 value=f"{entity.name} Spawn Egg",
             )
 
-    def generate(self):
+    def __generate(self, workers: int) -> BuildReport:
+        try:
+            return self.__build(workers)
+        except BaseException:
+            # Failed or cancelled, the sink must not carry this build over into the next one
+            self.sink.abort()
+            raise
+
+    def __build(self, workers: int) -> BuildReport:
+        start = time.perf_counter()
+        self.build_index.start()
+        if self.validate_first:
+            with self.__phase("validate"):
+                validation = self.validate()
+            if not validation.ok:
+                error(
+                    "The addon has %d problems, nothing was written:\n%s",
+                    len(validation),
+                    validation,
+                )
+        self.lang = self.custom_lang.copy()
+        self.atlases = AtlasRegistry()
+        self.textures.start()
+        self.__recipe_fingerprints = {}
+        # With more than one worker the per object phases only queue their files,
+        # waiting for the last ones to be written only counts towards the total time
+        with self.__emission_stage(workers):
+            with self.__phase("items"):
+                self.__generate_items()
+            with self.__phase("blocks"):
+                self.__generate_blocks()
+            with self.__phase("recipes"):
+                self.__generate_recipes()
+            with self.__phase("entities"):
+                self.__generate_entities()
+        # Shared files are written after every per object file is done
+        self.__check_cancelled()
+        with self.__phase("textures"):
+            self.__write_textures()
+        with self.__phase("atlases"):
+            self.__write_atlases()
+        with self.__phase("lang"):
+            self.__write_lang()
+        with self.__phase("manifests"):
+            # Partial builds keep the manifests (so the random pack uuids and version) of the last build.
+            # Deterministic uuids don't change, those manifests are written again so the version follows
+            # the contents (unchanged manifests are skipped like any other file)
+            if self.__changed is None or self.deterministic or not self.__keep_manifests():
+                self.initalize()
+        report = self.build_index.finish()
+        report.stats.seconds = time.perf_counter() - start
+        addon_path = self.sink.close(self.namespace)
+        if addon_path is not None:
+            info("Wrote '%s'", addon_path)
+        info("Finished generating: %s, %s", report, report.stats)
+        return report
+
+    def __keep_manifests(self) -> bool:
+        kept = [
+            self.build_index.keep(self.__name(path.joinpath("manifest.json")))
+            for path in (self.behaviour_path, self.resource_path)
+        ]
+        return all(kept)
+
+    def generate(self) -> BuildReport:
         """
         Generate the files for the addon like items, blocks, recipes, etc...
+        Returns which files were written, skipped (unchanged) and deleted (no longer generated)
+        and the build stats (report.stats)
+        """
+        self.__cancelled.clear()
+        return self.__generate(self.workers)
+
+    def regenerate(self, content_ids: Iterable[str]) -> BuildReport:
         """
-        self.__generate_items()
-        self.__generate_blocks()
-        self.__generate_recipes()
-        self.__generate_entities()
+        Partial build after the items/blocks/entities/recipes with these ids ("id" or "namespace:id")
+        were added, changed or removed, e.g. by a watcher (see watch.py). Only their files are
+        encoded and written again, the other per object files and the manifests are kept from the last build
+        (deterministic builds still bump the version if the contents changed). Atlases and lang files are rebuilt and only written if an entry changed
+        """
+        self.__cancelled.clear()
+        self.__changed = {self.registry.identifier(content_id) for content_id in content_ids}
+        try:
+            return self.__generate(self.workers)
+        finally:
+            self.__changed = None
+
+    async def generate_async(self, concurrency: int | None = None) -> BuildReport:
+        """
+        Same as generate() but doesn't block the event loop, files are written by up to
+        concurrency threads (the managers workers by default).
+        Cancelling the task stops the build at the next file and waits for it to stop before raising
+        """
+        self.__cancelled.clear()
+        build = asyncio.ensure_future(
+            asyncio.to_thread(
+                self.__generate, self.workers if concurrency is None else concurrency
+            )
+        )
+        try:
+            return await asyncio.shield(build)
+        except asyncio.CancelledError:
+            self.__cancelled.set()
+            # Nothing may still be writing once the cancel is done
+            with contextlib.suppress(BuildCancelled):
+                await build
+            raise
@@ -0,0 +1,127 @@
+import pathlib
+import threading
+import time
+import zipfile
+# If you have a linter/pylint, it will show these as errors but it works and I don't know how to remove the error
+from .util import OUT_DIRECTORY
+from .output import OutputSink
+
+# Zip files can't store dates before 1980, this is the earliest timestamp they support
+FIXED_TIMESTAMP = (1980, 1, 1, 0, 0, 0)
+
+
+# https://wiki.bedrock.dev/guide/project-setup.html#exporting-your-addon
+class ArchiveSink(OutputSink):
+    """
+    Writes every pack straight into a (pack folder name).mcpack file and combines them into
+    a (name).mcaddon, so no file has to be written to the out folder and zipped afterwards
+    """
+
+    compression_level: int
+    sorted_members: bool
+    timestamp: tuple[int, int, int, int, int, int] | None
+
+    def __init__(
+        self,
+        directory: pathlib.Path = OUT_DIRECTORY,
+        compression_level: int = 6,
+        sorted_members: bool = True,
+        timestamp: tuple[int, int, int, int, int, int] | None = FIXED_TIMESTAMP,
+    ) -> None:
+        """
+        directory: where the .mcpack and .mcaddon files are written
+        compression_level: 0 (stored, fastest) to 9 (smallest)
+        sorted_members: buffer the members and write them sorted by path when closing, so archives
+            don't depend on the order files were generated in (e.g. when writing in parallel)
+        timestamp: the modification time of every member, None uses the current time
+        """
+        super().__init__(directory)
+        self.compression_level = compression_level
+        self.sorted_members = sorted_members
+        self.timestamp = timestamp
+        self.packs: dict[str, zipfile.ZipFile] = {}
+        self.members: dict[str, list[tuple[str, bytes]]] = {}
+        # Zip files aren't thread safe and write() may be called from the parallel emission threads
+        self.lock = threading.Lock()
+
+    def __zip_info(self, name: str) -> zipfile.ZipInfo:
+        info = zipfile.ZipInfo(
+            name,
+            date_time=time.localtime()[:6] if self.timestamp is None else self.timestamp,
+        )
+        info.external_attr = 0o644 << 16
+        if self.compression_level > 0:
+            info.compress_type = zipfile.ZIP_DEFLATED
+        return info
+
+    def __pack(self, pack: str) -> zipfile.ZipFile:
+        if pack not in self.packs:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self.packs[pack] = zipfile.ZipFile(
+                self.directory.joinpath(f"{pack}.mcpack"), "w"
+            )
+        return self.packs[pack]
+
+    def __add(self, pack: str, member: str, data: bytes):
+        info = self.__zip_info(member)
+        self.__pack(pack).writestr(
+            info,
+            data,
+            compresslevel=self.compression_level
+            if info.compress_type == zipfile.ZIP_DEFLATED
+            else None,
+        )
+
+    def write(self, name: str, data: bytes, atomic: bool = False):
+        """
+        Add a file to its pack, name is "(pack folder)/(path inside the pack)"
+        """
+        pack, _, member = name.partition("/")
+        with self.lock:
+            if self.sorted_members:
+                self.members.setdefault(pack, []).append((member, data))
+            else:
+                self.__add(pack, member, data)
+
+    def exists(self, name: str) -> bool:
+        # Archives are always written from scratch, so there is nothing to skip or delete
+        return False
+
+    def delete(self, name: str):
+        pass
+
+    def abort(self):
+        """
+        Forget the buffered members and remove the unfinished .mcpack files, the next build
+        would otherwise add its members again next to the ones of the failed build
+        """
+        with self.lock:
+            self.members = {}
+            for archive in self.packs.values():
+                archive.close()
+                pathlib.Path(archive.filename).unlink(missing_ok=True)  # type: ignore
+            self.packs = {}
+
+    def close(self, addon_name: str) -> pathlib.Path:
+        """
+        Finish every .mcpack and put them into (addon_name).mcaddon, returns the path of the .mcaddon
+        """
+        with self.lock:
+            for pack, members in self.members.items():
+                for member, data in sorted(members, key=lambda entry: entry[0]):
+                    self.__add(pack, member, data)
+            self.members = {}
+
+            addon_path = self.directory.joinpath(f"{addon_name}.mcaddon")
+            with zipfile.ZipFile(addon_path, "w") as addon:
+                for pack in sorted(self.packs):
+                    archive = self.packs[pack]
+                    archive.close()
+                    # The packs are already compressed, storing them as they are is enough
+                    addon.writestr(
+                        self.__zip_info(f"{pack}.mcpack"),
+                        pathlib.Path(archive.filename).read_bytes(),  # type: ignore
+                        compress_type=zipfile.ZIP_STORED,
+                    )
+            self.packs = {}
+        return addon_path
@@ -0,0 +1,96 @@
+import pathlib
+from typing import Callable
+# If you have a linter/pylint, it will show these as errors but it works and I don't know how to remove the error
+from .util import error, write_atomic
+from .constants import FORMAT_VERSION_BLOCK_SOUND
+from .json_profile import JsonProfile, encode_json
+
+# https://wiki.bedrock.dev/concepts/texture-atlases.html
+class AtlasRegistry:
+    """
+    Collects the item/terrain texture atlases and block sounds and writes each of them once
+    """
+
+    item_textures: dict[str, dict]
+    terrain_textures: dict[str, dict]
+    block_sounds: dict[str, dict]
+
+    def __init__(self) -> None:
+        self.item_textures = {}
+        self.terrain_textures = {}
+        self.block_sounds = {}
+
+    def __add(self, entries: dict[str, dict], atlas: str, name: str, data: dict):
+        if name in entries:
+            error(f"Duplicate entry '{name}' in {atlas}")
+        entries[name] = data
+
+    def add_item_texture(self, name: str, texture: str):
+        """
+        Add an item texture to textures/item_texture.json
+        """
+        self.__add(self.item_textures, "item_texture.json", name, {"textures": texture})
+
+    def add_block_texture(self, name: str, texture: str):
+        """
+        Add a block texture to textures/terrain_texture.json
+        """
+        self.__add(
+            self.terrain_textures, "terrain_texture.json", name, {"textures": texture}
+        )
+
+    def add_block_sound(self, name: str, sound: str):
+        """
+        Add a block sound to blocks.json
+        """
+        self.__add(
+            self.block_sounds, "blocks.json", name, {"sound": sound, "textures": name}
+        )
+
+    def construct_item_atlas(self) -> dict:
+        """
+        Returns the textures/item_texture.json used inside a resource pack
+        """
+        return {"texture_name": "atlas.items", "texture_data": self.item_textures}
+
+    def construct_terrain_atlas(self) -> dict:
+        """
+        Returns the textures/terrain_texture.json used inside a resource pack
+        """
+        return {
+            "texture_name": "atlas.terrain",
+            "padding": 8,
+            "num_mip_levels": 4,
+            "texture_data": self.terrain_textures,
+        }
+
+    def construct_block_sounds(self) -> dict:
+        """
+        Returns the blocks.json used inside a resource pack
+        """
+        return {"format_version": FORMAT_VERSION_BLOCK_SOUND, **self.block_sounds}
+
+    def write(
+        self,
+        resource_path: pathlib.Path,
+        write_file: Callable[[pathlib.Path, str], object] = write_atomic,
+        profile: JsonProfile = JsonProfile.PRETTY,
+    ):
+        """
+        Write every non empty atlas into the resource pack, each file is replaced atomically
+        """
+        if self.item_textures:
+            write_file(
+                resource_path.joinpath("textures/item_texture.json"),
+                encode_json(self.construct_item_atlas(), profile),
+            )
+        if self.terrain_textures:
+            write_file(
+                resource_path.joinpath("textures/terrain_texture.json"),
+                encode_json(self.construct_terrain_atlas(), profile),
+            )
+        if self.block_sounds:
+            write_file(
+                resource_path.joinpath("blocks.json"),
+                encode_json(self.construct_block_sounds(), profile),
+            )
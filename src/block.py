@@ -1,8 +1,11 @@
 import enum
+from typing import Mapping
 # If you have a linter/pylint, it will show these as errors but it works and I don't know how to remove the error
 from .constants import FORMAT_VERSION_BLOCK
 from .creative_category import CreativeCategory
+from .lang import NO_TRANSLATIONS
 from .recipe import CraftingRecipeShapeless, CraftingRecipeShaped
+from .recipe_graph import recipe_set
 
 # https://wiki.bedrock.dev/blocks/block-sounds.html
 # Last updated for 1.19.80
@@ -101,8 +104,23 @@ class Block:
     A minecraft bedrock block
     """
 
+    __slots__ = (
+        "id",
+        "display_name",
+        "translations",
+        "texture_path",
+        "category",
+        "sound",
+        "hardness",
+        "resistance",
+        "render_method",
+        "has_gravity",
+        "recipe",
+    )
+
     id: str
     display_name: str
+    translations: Mapping[str, str]
     texture_path: str | None
     category: CreativeCategory
     sound: BlockSounds
@@ -117,6 +135,7 @@ class Block:
     def __init__(self) -> None:
         self.id = "placeholder"
         self.display_name = "Placeholder"
+        self.translations = NO_TRANSLATIONS
         self.texture_path = (
             None  # If None, it will use the default path that uses id as file name
         )
@@ -142,9 +161,19 @@ class Block:
         self.display_name = display_name
         return self
 
+    def set_translation(self, language: str, display_name: str):
+        """
+        Sets the blocks display name for another language (e.g. "de_DE")
+        """
+        if self.translations is NO_TRANSLATIONS:
+            self.translations = {}
+        self.translations[language] = display_name  # type: ignore
+        return self
+
     def set_texture_path(self, texture_path: str):
         """
-        Sets the blocks texture path (if not provided, it will use default that uses id for file name in textures/blocks/id)
+        Sets the blocks texture path (if not provided, it will use default that uses id for file name in textures/blocks/id).
+        A path to an image file (e.g. "art/ruby_block.png") copies the image into the pack
         """
         self.texture_path = texture_path
         return self
@@ -195,6 +224,7 @@ class Block:
         self.recipe = recipe
         self.recipe.item_id = self.id
         self.recipe.result_item_id = self.id
+        recipe_set(self)
         return self
 
     def construct(self, namespace: str) -> dict:
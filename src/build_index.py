@@ -0,0 +1,140 @@
+import collections
+import hashlib
+import pathlib
+import threading
+# If you have a linter/pylint, it will show these as errors but it works and I don't know how to remove the error
+from .output import OutputSink
+from .build_stats import BuildStats
+
+
+class BuildReport:
+    """
+    What a build wrote, skipped (unchanged) and deleted (stale), as paths relative to the out folder,
+    and its stats (timings, bytes written...)
+    """
+
+    written: list[str]
+    skipped: list[str]
+    deleted: list[str]
+    stats: BuildStats
+
+    def __init__(self) -> None:
+        self.written = []
+        self.skipped = []
+        self.deleted = []
+        self.stats = BuildStats()
+
+    def __repr__(self) -> str:
+        return (
+            f"BuildReport(written={len(self.written)}, "
+            f"skipped={len(self.skipped)}, deleted={len(self.deleted)})"
+        )
+
+
+class BuildIndex:
+    """
+    Keeps the content hash of every file the addon wrote so unchanged files can be skipped
+    and files that are no longer generated can be deleted
+    """
+
+    sink: OutputSink
+    hashes: dict[str, str]
+    previous: dict[str, str]
+    report: BuildReport
+
+    def __init__(self, sink: OutputSink, incremental: bool = False) -> None:
+        self.sink = sink
+        self.hashes = {}
+        # write() may be called from the parallel emission threads
+        self.lock = threading.Lock()
+        self.previous = self.sink.load_index() if incremental else {}
+        self.report = BuildReport()
+        # The sinks file system calls when the build started, the report counts the ones made since
+        self.calls_at_start = collections.Counter()
+
+    def start(self):
+        """
+        Forget what a (cancelled or failed) build recorded before it finished
+        """
+        with self.lock:
+            self.hashes = {}
+            self.report = BuildReport()
+            self.calls_at_start = collections.Counter(self.sink.filesystem_calls)
+
+    def write(self, name: str, text: str | bytes, atomic: bool = False) -> bool:
+        """
+        Write the file to the sink if its content changed since the last build, returns if it was written
+        """
+        data = text.encode("utf-8") if isinstance(text, str) else text
+        digest = hashlib.sha256(data).hexdigest()
+        with self.lock:
+            self.hashes[name] = digest
+        if self.previous.get(name) == digest and self.sink.exists(name):
+            with self.lock:
+                self.report.skipped.append(name)
+            return False
+        self.sink.write(name, data, atomic=atomic)
+        with self.lock:
+            self.report.written.append(name)
+            self.report.stats.bytes_written += len(data)
+        return True
+
+    def copy(self, name: str, source: pathlib.Path, digest: str) -> bool:
+        """
+        Copy a file (with the given content hash) to the sink unless it is unchanged, returns if it was copied
+        """
+        with self.lock:
+            self.hashes[name] = digest
+        if self.previous.get(name) == digest and self.sink.exists(name):
+            with self.lock:
+                self.report.skipped.append(name)
+            return False
+        self.sink.copy_file(name, source)
+        with self.lock:
+            self.report.written.append(name)
+            self.report.stats.bytes_written += source.stat().st_size
+        return True
+
+    def keep(self, name: str) -> bool:
+        """
+        Keep a file of the last build as it is (for files a partial build doesn't write again),
+        returns False if the last build didn't write it
+        """
+        digest = self.previous.get(name)
+        if digest is None or not self.sink.exists(name):
+            return False
+        with self.lock:
+            self.hashes[name] = digest
+            self.report.skipped.append(name)
+        return True
+
+    def content_hash(self, exclude: set[str] = set()) -> str:
+        """
+        Returns one hash over every file written this build (except the excluded ones)
+        """
+        combined = hashlib.sha256()
+        for name in sorted(self.hashes.keys() - exclude):
+            combined.update(f"{name}\0{self.hashes[name]}\n".encode("utf-8"))
+        return combined.hexdigest()
+
+    def finish(self) -> BuildReport:
+        """
+        Delete the files of the last build that weren't generated this time and save the index
+        """
+        for name in self.previous.keys() - self.hashes.keys():
+            self.sink.delete(name)
+            self.report.deleted.append(name)
+        # Parallel builds finish writes in any order, keep the report the same as a serial build
+        self.report.written.sort()
+        self.report.skipped.sort()
+        self.report.deleted.sort()
+        self.sink.save_index(self.hashes)
+        self.previous = dict(self.hashes)
+        self.hashes = {}
+        report = self.report
+        report.stats.files_written = len(report.written)
+        report.stats.filesystem_calls = dict(
+            collections.Counter(self.sink.filesystem_calls) - self.calls_at_start
+        )
+        self.report = BuildReport()
+        return report
@@ -0,0 +1,43 @@
+class BuildStats:
+    """
+    How long a build took (in seconds, per phase) and how much it wrote
+    """
+
+    seconds: float
+    phase_seconds: dict[str, float]
+    files_written: int
+    bytes_written: int
+    encode_seconds: float
+    filesystem_calls: dict[str, int]
+
+    def __init__(self) -> None:
+        self.seconds = 0.0
+        self.phase_seconds = {}
+        self.files_written = 0
+        self.bytes_written = 0
+        # Time spent building and encoding the json of the per object files and manifests
+        self.encode_seconds = 0.0
+        # Calls like open/write/mkdir/stat the sink made on the file system, by name
+        self.filesystem_calls = {}
+
+    def as_dict(self) -> dict:
+        """
+        Returns the stats as a json friendly dict (e.g. to send them to a metrics service)
+        """
+        return {
+            "seconds": self.seconds,
+            "phase_seconds": dict(self.phase_seconds),
+            "files_written": self.files_written,
+            "bytes_written": self.bytes_written,
+            "encode_seconds": self.encode_seconds,
+            "filesystem_calls": dict(self.filesystem_calls),
+        }
+
+    def __repr__(self) -> str:
+        phases = ", ".join(
+            f"{phase}={seconds:.3f}s" for phase, seconds in self.phase_seconds.items()
+        )
+        return (
+            f"BuildStats(seconds={self.seconds:.3f}, {phases}, "
+            f"files_written={self.files_written}, bytes_written={self.bytes_written})"
+        )
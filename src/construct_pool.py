@@ -0,0 +1,91 @@
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, Sequence
+# If you have a linter/pylint, it will show these as errors but it works and I don't know how to remove the error
+from .templates import encode_construct
+from .json_profile import JsonProfile, encode_json
+
+
+def encode_object(
+    namespace: str, methods: tuple[str, ...], obj, profile: JsonProfile = JsonProfile.PRETTY
+) -> tuple[str, ...]:
+    """
+    Construct and encode one object (item, block, recipe, entity) with every construct method,
+    items and blocks go through their precompiled templates
+    """
+    return tuple(
+        encode_construct(namespace, obj, profile)
+        if method == "construct"
+        else encode_json(getattr(obj, method)(namespace), profile)
+        for method in methods
+    )
+
+
+def encode_objects(
+    namespace: str, methods: tuple[str, ...], objects: Sequence, profile: JsonProfile
+) -> list[tuple[str, ...]]:
+    """
+    Construct and encode a chunk of objects, this runs inside the worker processes
+    """
+    return [encode_object(namespace, methods, obj, profile) for obj in objects]
+
+
+class ConstructPool:
+    """
+    Shards the construct() + json encoding of big object lists across worker processes
+    """
+
+    processes: int
+    chunk_size: int
+    profile: JsonProfile
+    executor: ProcessPoolExecutor | None
+
+    def __init__(
+        self,
+        processes: int,
+        chunk_size: int = 1000,
+        profile: JsonProfile = JsonProfile.PRETTY,
+    ) -> None:
+        self.processes = processes
+        self.chunk_size = max(1, chunk_size)
+        self.profile = profile
+        self.executor = None
+
+    def encode(
+        self, namespace: str, methods: tuple[str, ...], objects: Sequence
+    ) -> Iterator[tuple[str, ...]]:
+        """
+        Yields the encoded json of every method for every object, in the same order as objects.
+        Lists that fit in one chunk are encoded in this process since sending them to a worker costs more than it saves
+        """
+        if self.processes <= 1 or len(objects) <= self.chunk_size:
+            for obj in objects:
+                yield encode_object(namespace, methods, obj, self.profile)
+            return
+
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.processes)
+        chunks = self.__chunks(objects)
+        # map() returns the chunks in submission order so the output doesn't depend on scheduling
+        for encoded in self.executor.map(
+            encode_objects,
+            itertools.repeat(namespace),
+            itertools.repeat(methods),
+            chunks,
+            itertools.repeat(self.profile),
+        ):
+            yield from encoded
+
+    def __chunks(self, objects: Sequence) -> Iterator[Sequence]:
+        for start in range(0, len(objects), self.chunk_size):
+            yield objects[start : start + self.chunk_size]
+
+    def close(self):
+        """
+        Stop the worker processes (if any were started)
+        """
+        if self.executor is not None:
+            # Chunks not started yet (e.g. the build failed or was cancelled) are dropped
+            self.executor.shutdown(wait=True, cancel_futures=True)
+            self.executor = None
+
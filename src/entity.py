@@ -7,6 +7,17 @@ class Entity:
     A minecraft bedrock entity
     """
 
+    __slots__ = (
+        "id",
+        "name",
+        "textures",
+        "egg_should_use_texture",
+        "egg_texture_path",
+        "egg_base_color",
+        "egg_overlay_color",
+        "can_wear_armor",
+    )
+
     id: str
     name: str
     textures: dict[str, str]
@@ -1,7 +1,10 @@
+from typing import Mapping
 # If you have a linter/pylint, it will show these as errors but it works and I don't know how to remove the error
 from .constants import FORMAT_VERSION_ITEM
 from .creative_category import CreativeCategory
+from .lang import NO_TRANSLATIONS
 from .recipe import CraftingRecipeShapeless, CraftingRecipeShaped
+from .recipe_graph import recipe_set
 
 # https://wiki.bedrock.dev/items/items-16.html
 # Requires Holiday Features Enabled (as of May 12th, 2023)
@@ -10,8 +13,26 @@ class Item:
     A minecraft bedrock item
     """
 
+    # Slots instead of a __dict__, big catalogs hold a lot of these in memory
+    __slots__ = (
+        "id",
+        "display_name",
+        "translations",
+        "texture_path",
+        "category",
+        "max_stack_size",
+        "will_despawn",
+        "is_food",
+        "food_bars",
+        "use_duration",
+        "enchanted",
+        "allow_off_hand",
+        "recipe",
+    )
+
     id: str
     display_name: str
+    translations: Mapping[str, str]
     texture_path: str | None
     category: CreativeCategory
     max_stack_size: int
@@ -29,6 +50,7 @@ class Item:
     def __init__(self) -> None:
         self.id = "placeholder"
         self.display_name = "Placeholder"
+        self.translations = NO_TRANSLATIONS
         self.texture_path = (
             None  # If None, it will use the default path that uses id as file name
         )
@@ -59,9 +81,19 @@ class Item:
         self.display_name = display_name
         return self
 
+    def set_translation(self, language: str, display_name: str):
+        """
+        Sets the items display name for another language (e.g. "de_DE")
+        """
+        if self.translations is NO_TRANSLATIONS:
+            self.translations = {}
+        self.translations[language] = display_name  # type: ignore
+        return self
+
     def set_texture_path(self, texture_path: str):
         """
-        Sets the items texture path (if not provided, it will use default that uses id for file name in textures/items/id)
+        Sets the items texture path (if not provided, it will use default that uses id for file name in textures/items/id).
+        A path to an image file (e.g. "art/ruby.png") copies the image into the pack
         """
         self.texture_path = texture_path
         return self
@@ -123,6 +155,7 @@ class Item:
         self.recipe = recipe
         self.recipe.item_id = self.id
         self.recipe.result_item_id = self.id
+        recipe_set(self)
         return self
 
     def construct(self, namespace: str) -> dict:
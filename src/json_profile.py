@@ -0,0 +1,36 @@
+import enum
+import json
+
+# orjson is optional, the fast profile uses the standard library (like compact) without it
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class JsonProfile(enum.Enum):
+    """
+    How the json files of the addon are written, every profile gives the same documents
+    """
+
+    # Indented with 4 spaces (the default, easy to read)
+    PRETTY = "pretty"
+    # No whitespace, smaller packs
+    COMPACT = "compact"
+    # No whitespace, encoded with orjson when it is installed
+    FAST = "fast"
+
+
+def encode_json(data, profile: JsonProfile = JsonProfile.PRETTY) -> str:
+    """
+    Returns data as json text written the way the profile wants
+    """
+    if profile is JsonProfile.PRETTY:
+        return json.dumps(data, indent=4)
+    if profile is JsonProfile.FAST and orjson is not None:
+        try:
+            return orjson.dumps(data).decode("utf-8")
+        except TypeError:
+            # Things orjson doesn't write (e.g. non string keys or huge ints)
+            pass
+    return json.dumps(data, separators=(",", ":"))
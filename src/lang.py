@@ -0,0 +1,94 @@
+import pathlib
+from typing import Callable, Iterator, Mapping
+# If you have a linter/pylint, it will show these as errors but it works and I don't know how to remove the error
+from .util import error, debug, write_atomic
+from .json_profile import JsonProfile, encode_json
+
+DEFAULT_LANGUAGE = "en_US"
+
+
+class _NoTranslations(Mapping[str, str]):
+    """
+    Read only empty translations, shared by every item/block until it gets its first translation
+    since most only have the default language
+    """
+
+    def __getitem__(self, key: str) -> str:
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(())
+
+    def __len__(self) -> int:
+        return 0
+
+    def __reduce__(self):
+        # Unpickles (e.g. in the construct worker processes) as the same shared instance
+        return "NO_TRANSLATIONS"
+
+
+NO_TRANSLATIONS = _NoTranslations()
+
+# https://wiki.bedrock.dev/concepts/text-and-translations.html
+class LangTable:
+    """
+    Collects translation keys for any number of languages and writes each .lang file once
+    """
+
+    languages: dict[str, dict[str, str]]
+
+    def __init__(self) -> None:
+        self.languages = {DEFAULT_LANGUAGE: {}}
+
+    def add(self, key: str, value: str, language: str = DEFAULT_LANGUAGE):
+        """
+        Add a key to a language, duplicate keys in the same language are an error
+        """
+        entries = self.languages.setdefault(language, {})
+        if key in entries:
+            error(
+                f"Duplicate lang key '{key}' in language {language} "
+                f"('{entries[key]}' and '{value}')"
+            )
+        debug("Adding '%s' to language %s with value '%s'", key, language, value)
+        entries[key] = value
+
+    def copy(self) -> "LangTable":
+        """
+        Returns a copy of the table that can be added to without changing this one
+        """
+        table = LangTable()
+        table.languages = {
+            language: dict(entries) for language, entries in self.languages.items()
+        }
+        return table
+
+    def get(self, key: str, language: str = DEFAULT_LANGUAGE) -> str | None:
+        """
+        Returns the value of the key in the language, or None if it isn't set
+        """
+        return self.languages.get(language, {}).get(key)
+
+    def construct(self, language: str) -> str:
+        """
+        Returns the (language).lang file contents
+        """
+        return "".join(
+            f"{key}={value}\n" for key, value in self.languages[language].items()
+        )
+
+    def write(
+        self,
+        texts_path: pathlib.Path,
+        write_file: Callable[[pathlib.Path, str], object] = write_atomic,
+        profile: JsonProfile = JsonProfile.PRETTY,
+    ):
+        """
+        Write every language to texts/(language).lang and the list of them to texts/languages.json
+        """
+        for language in self.languages:
+            write_file(texts_path.joinpath(f"{language}.lang"), self.construct(language))
+        write_file(
+            texts_path.joinpath("languages.json"),
+            encode_json(list(self.languages), profile),
+        )
@@ -0,0 +1,256 @@
+import csv
+import enum
+import inspect
+import json
+import pathlib
+import types
+import typing
+from typing import Iterator
+# If you have a linter/pylint, it will show these as errors but it works and I don't know how to remove the error
+from .util import AddonError
+from .item import Item
+from .block import Block
+from .entity import Entity
+from .recipe import CraftingRecipeShapeless, CraftingRecipeShaped, RecipeIngredient
+
+# The "type" of a row and the class it is loaded into
+ROW_TYPES = {
+    "item": Item,
+    "block": Block,
+    "entity": Entity,
+    "recipe_shapeless": CraftingRecipeShapeless,
+    "recipe_shaped": CraftingRecipeShaped,
+}
+
+
+class RowError:
+    """
+    A row of a catalog file that couldn't be loaded
+    """
+
+    path: pathlib.Path
+    line: int
+    message: str
+
+    def __init__(self, path: pathlib.Path, line: int, message: str) -> None:
+        self.path = path
+        self.line = line
+        self.message = message
+
+    def __str__(self) -> str:
+        return f"{self.path}:{self.line}: {self.message}"
+
+    def __repr__(self) -> str:
+        return f"RowError({self})"
+
+
+class LoadReport:
+    """
+    How many rows of a catalog file were loaded and the errors of the ones that weren't
+    """
+
+    loaded: int
+    errors: list[RowError]
+
+    def __init__(self) -> None:
+        self.loaded = 0
+        self.errors = []
+
+    def __repr__(self) -> str:
+        return f"LoadReport(loaded={self.loaded}, errors={len(self.errors)})"
+
+
+def read_rows(path: pathlib.Path) -> Iterator[tuple[int, dict | ValueError]]:
+    """
+    Yields (line number, row) for every row of a .jsonl or .csv file, one row at a time.
+    Empty lines/cells are skipped and lines that aren't valid json are yielded as their error
+    """
+    with path.open(encoding="utf-8", newline="") as file:
+        if path.suffix == ".csv":
+            reader = csv.reader(file)
+            header = next(reader, [])
+            while True:
+                # The line a row starts on, cells can span lines (e.g. patterns)
+                line = reader.line_num + 1
+                values = next(reader, None)
+                if values is None:
+                    break
+                if not values:
+                    continue
+                # Short rows just don't have their last cells
+                yield line, {
+                    key: value for key, value in zip(header, values) if key and value != ""
+                }
+        else:
+            for line, text in enumerate(file, start=1):
+                if not text.strip():
+                    continue
+                try:
+                    yield line, json.loads(text.strip())
+                except ValueError as err:
+                    yield line, err
+
+
+def _parse(value, annotation):
+    """
+    Convert a (csv) value to the type a setter expects
+    """
+    if (
+        isinstance(annotation, types.UnionType)
+        or typing.get_origin(annotation) is typing.Union
+    ):
+        options = [
+            option for option in typing.get_args(annotation) if option is not type(None)
+        ]
+        # int | float: keep whole numbers as int
+        if int in options and float in options:
+            if isinstance(value, str):
+                number = float(value)
+                if number.is_integer() and "." not in value:
+                    return int(number)
+                return number
+            return value
+        return _parse(value, options[0])
+    if inspect.isclass(annotation) and issubclass(annotation, enum.Enum):
+        if isinstance(value, annotation):
+            return value
+        try:
+            return annotation(value)
+        except ValueError:
+            try:
+                return annotation[str(value).upper()]
+            except KeyError:
+                allowed = ", ".join(str(member.value) for member in annotation)
+                raise ValueError(f"'{value}' is not one of {allowed}") from None
+    if annotation is bool:
+        if isinstance(value, str):
+            if value.lower() in ("true", "yes", "1"):
+                return True
+            if value.lower() in ("false", "no", "0"):
+                return False
+            raise ValueError(f"'{value}' is not true or false")
+        return bool(value)
+    if annotation in (int, float) and not isinstance(value, annotation):
+        if isinstance(value, bool):
+            raise ValueError(f"'{value}' is not a number")
+        return annotation(value)
+    if annotation is str and not isinstance(value, str):
+        raise ValueError(f"'{value}' is not text")
+    return value
+
+
+def _parse_json_cell(value):
+    """
+    Csv cells can hold lists/objects (e.g. recipes) as json
+    """
+    if isinstance(value, str) and value[:1] in ("[", "{"):
+        return json.loads(value)
+    return value
+
+
+def _parse_ingredient(value) -> RecipeIngredient:
+    """
+    An ingredient is {"item_id": ..., "count": ...} or "item_id" or "item_id*count"
+    """
+    if isinstance(value, dict):
+        return RecipeIngredient(
+            item_id=value["item_id"], count=int(value.get("count", 1))
+        )
+    item_id, _, count = str(value).partition("*")
+    return RecipeIngredient(item_id=item_id, count=int(count) if count else 1)
+
+
+def _apply(obj, key: str, value):
+    if key == "translations":
+        for language, display_name in dict(_parse_json_cell(value)).items():
+            obj.set_translation(language, display_name)
+        return
+    if key.startswith("translation."):
+        # csv friendly form, e.g. a "translation.de_DE" column
+        obj.set_translation(key.partition(".")[2], value)
+        return
+    if key == "recipe":
+        recipe = build_object(
+            dict(_parse_json_cell(value)), default_type="recipe_shapeless"
+        )
+        obj.set_recipe(recipe)
+        return
+    if key == "ingredients":
+        value = _parse_json_cell(value)
+        if isinstance(value, str):
+            value = value.split(";")
+        obj.set_ingredients([_parse_ingredient(ingredient) for ingredient in value])
+        return
+    if key == "key":
+        value = _parse_json_cell(value)
+    if key == "pattern" and isinstance(value, str):
+        # One row per line (a quoted multi line csv cell), any other character can be a symbol
+        value = _parse_json_cell(value) if value.startswith("[") else value.splitlines()
+
+    setter = getattr(obj, f"set_{key}", None)
+    if setter is None:
+        raise ValueError(f"Unknown field '{key}' for {type(obj).__name__}")
+    parameters = list(inspect.signature(setter).parameters.values())
+    if not parameters:
+        # Flags like set_enchanted() only get called when the value is true
+        if _parse(value, bool):
+            setter()
+        return
+    hints = typing.get_type_hints(setter)
+    setter(_parse(value, hints.get(parameters[0].name, str)))
+
+
+def build_object(row: dict, default_type: str | None = None):
+    """
+    Build an Item/Block/Entity/recipe from a row, the "type" field chooses which and every other
+    field calls the matching setter (e.g. "max_stack_size" calls set_max_stack_size)
+    """
+    if not isinstance(row, dict):
+        raise ValueError(f"Expected an object, got '{row}'")
+    row_type = row.get("type", default_type)
+    if row_type not in ROW_TYPES:
+        raise ValueError(
+            f"Unknown type '{row_type}', expected one of {', '.join(ROW_TYPES)}"
+        )
+    obj = ROW_TYPES[row_type]()
+    # set_recipe() uses the id, so the recipe is always set last
+    for key, value in sorted(row.items(), key=lambda field: field[0] == "recipe"):
+        if key == "type":
+            continue
+        try:
+            _apply(obj, key, value)
+        except Exception as err:
+            # Also catches the setters own errors, e.g. RecipeIngredient rejecting a count
+            raise ValueError(f"{key}: {err}") from err
+    return obj
+
+
+def load_catalog(manager, path: pathlib.Path) -> LoadReport:
+    """
+    Stream a .jsonl/.csv catalog into the manager row by row, rows that can't be loaded
+    (or can't be added, e.g. duplicate ids) are reported with their line number and skipped
+    """
+    report = LoadReport()
+    for line, row in read_rows(path):
+        if isinstance(row, ValueError):
+            report.errors.append(RowError(path, line, f"Invalid json: {row}"))
+            continue
+        try:
+            obj = build_object(row)
+        except ValueError as err:
+            report.errors.append(RowError(path, line, str(err)))
+            continue
+        try:
+            if isinstance(obj, Item):
+                manager.add_item(obj)
+            elif isinstance(obj, Block):
+                manager.add_block(obj)
+            elif isinstance(obj, Entity):
+                manager.add_entity(obj)
+            else:
+                manager.add_recipe(obj)
+        except AddonError as err:
+            report.errors.append(RowError(path, line, str(err)))
+            continue
+        report.loaded += 1
+    return report
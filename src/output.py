@@ -0,0 +1,256 @@
+import collections
+import json
+import os
+import pathlib
+import shutil
+import threading
+# Only used to reflink (copy on write clone) files, not every platform has it
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+# If you have a linter/pylint, it will show these as errors but it works and I don't know how to remove the error
+from .util import warning, write_atomic, OUT_DIRECTORY, PACK_VERSIONS_PATH
+from .pack_version import PackVersions
+
+BUILD_INDEX_NAME = ".build_index.json"
+
+# The calls a (non atomic) file write makes and the ones an atomic write makes (see write_atomic)
+WRITE_CALLS = ("open", "write", "close")
+ATOMIC_WRITE_CALLS = ("mkdir", *WRITE_CALLS, "rename")
+
+# The FICLONE ioctl of Linux, clones a file on file systems that support it (btrfs, xfs...)
+FICLONE = 0x40049409
+
+
+class OutputSink:
+    """
+    Where the files of the addon go, names are relative to the out folder
+    (e.g. "(namespace)_behaviour/items/(id).json")
+    """
+
+    directory: pathlib.Path
+    filesystem_calls: collections.Counter
+    # Where deterministic builds keep the pack versions, outside the out folder so clean() doesn't reset them
+    pack_versions_path: pathlib.Path | None
+
+    def __init__(self, directory: pathlib.Path = OUT_DIRECTORY) -> None:
+        self.directory = directory
+        self.pack_versions_path = PACK_VERSIONS_PATH
+        # Calls made on the file system by name (e.g. "open", "mkdir"), sinks that don't touch it stay at 0
+        self.filesystem_calls = collections.Counter()
+
+    def clean(self):
+        """
+        Remove everything the sink holds (before a full, non incremental build)
+        """
+
+    def make_folder(self, name: str):
+        """
+        Make sure an (empty) folder exists, only matters for sinks that have folders
+        """
+
+    def write(self, name: str, data: bytes, atomic: bool = False):
+        """
+        Write a file, atomic writes never leave a half written file behind
+        """
+        raise NotImplementedError
+
+    def copy_file(self, name: str, source: pathlib.Path):
+        """
+        Put a copy of a file (e.g. a texture) into the sink
+        """
+        self.write(name, source.read_bytes())
+
+    def exists(self, name: str) -> bool:
+        """
+        Returns if the file is in the sink
+        """
+        raise NotImplementedError
+
+    def delete(self, name: str):
+        """
+        Remove a file (if it exists)
+        """
+        raise NotImplementedError
+
+    def load_index(self) -> dict[str, str]:
+        """
+        Returns the content hashes saved by the last build, sinks that can't skip unchanged files return nothing
+        """
+        return {}
+
+    def save_index(self, hashes: dict[str, str]):
+        """
+        Save the content hashes of this build for the next incremental build
+        """
+
+    def abort(self):
+        """
+        Called when generate() fails or is cancelled, drop what the sink still holds of that build
+        so the next build starts from scratch (files already written stay, like after a crash)
+        """
+
+    def pack_versions(self) -> PackVersions:
+        """
+        Returns the pack versions of the last deterministic builds (see pack_version.PackVersions)
+        """
+        return PackVersions(self.pack_versions_path)
+
+    def close(self, addon_name: str) -> pathlib.Path | None:
+        """
+        Called once generate() is done, returns the path of the finished output (if there is one)
+        """
+        return None
+
+
+class FileSystemSink(OutputSink):
+    """
+    Writes the addon as folders and files into the out folder
+    """
+
+    def __init__(
+        self, directory: pathlib.Path = OUT_DIRECTORY, link_files: bool = True
+    ) -> None:
+        """
+        link_files: copy_file() hard links (or reflinks) files instead of copying them when it can,
+            the out folder then shares them with their source (so don't edit them in the out folder)
+        """
+        super().__init__(directory)
+        self.link_files = link_files
+        # Folders already known to exist, so writing a file doesn't need an extra mkdir call
+        self.folders: set[pathlib.Path] = set()
+        # write() may be called from the parallel emission threads
+        self.lock = threading.Lock()
+
+    def __count(self, *calls: str):
+        with self.lock:
+            self.filesystem_calls.update(calls)
+
+    def clean(self):
+        self.__count("stat")
+        if self.directory.exists():
+            self.__count("rmtree")
+            shutil.rmtree(self.directory)
+        self.__count("mkdir")
+        self.directory.mkdir(parents=True)
+        self.folders = set()
+
+    def make_folder(self, name: str):
+        self.__count("mkdir")
+        self.directory.joinpath(name).mkdir(parents=True, exist_ok=True)
+
+    def write(self, name: str, data: bytes, atomic: bool = False):
+        path = self.directory.joinpath(name)
+        if path.parent not in self.folders:
+            self.__count("mkdir")
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self.folders.add(path.parent)
+        if atomic:
+            self.__count(*ATOMIC_WRITE_CALLS)
+            write_atomic(path, data)
+        else:
+            self.__count(*WRITE_CALLS)
+            path.write_bytes(data)
+
+    def copy_file(self, name: str, source: pathlib.Path):
+        path = self.directory.joinpath(name)
+        if path.parent not in self.folders:
+            self.__count("mkdir")
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self.folders.add(path.parent)
+        # Never write through an existing (possibly linked) file
+        self.__count("unlink")
+        path.unlink(missing_ok=True)
+        if self.link_files:
+            try:
+                self.__count("link")
+                os.link(source, path)
+                return
+            except OSError:
+                # e.g. the source is on another file system
+                pass
+            if self.__reflink(source, path):
+                return
+        self.__count("copy")
+        shutil.copyfile(source, path)
+
+    def __reflink(self, source: pathlib.Path, path: pathlib.Path) -> bool:
+        if fcntl is None:
+            return False
+        self.__count("open", "open", "ioctl", "close", "close")
+        try:
+            with source.open("rb") as source_file, path.open("wb") as file:
+                fcntl.ioctl(file.fileno(), FICLONE, source_file.fileno())
+            return True
+        except OSError:
+            return False
+
+    def exists(self, name: str) -> bool:
+        self.__count("stat")
+        return self.directory.joinpath(name).exists()
+
+    def delete(self, name: str):
+        self.__count("unlink")
+        self.directory.joinpath(name).unlink(missing_ok=True)
+
+    def load_index(self) -> dict[str, str]:
+        index_path = self.directory.joinpath(BUILD_INDEX_NAME)
+        self.__count("stat")
+        if not index_path.exists():
+            return {}
+        self.__count("open", "read", "close")
+        try:
+            return dict(json.loads(index_path.read_text(encoding="utf-8")))
+        except ValueError:
+            warning("Ignoring unreadable build index '%s'", index_path)
+            return {}
+
+    def save_index(self, hashes: dict[str, str]):
+        self.__count(*ATOMIC_WRITE_CALLS)
+        write_atomic(
+            self.directory.joinpath(BUILD_INDEX_NAME),
+            json.dumps(hashes, indent=4, sort_keys=True),
+        )
+
+
+class MemorySink(OutputSink):
+    """
+    Keeps the addon in memory (name -> bytes), for tests and services that don't want to touch the disk
+    """
+
+    files: dict[str, bytes]
+
+    def __init__(self, directory: pathlib.Path = OUT_DIRECTORY) -> None:
+        super().__init__(directory)
+        self.files = {}
+        self.index: dict[str, str] = {}
+        self.versions = PackVersions(None)
+        # write() may be called from the parallel emission threads
+        self.lock = threading.Lock()
+
+    def clean(self):
+        with self.lock:
+            self.files = {}
+            self.index = {}
+
+    def write(self, name: str, data: bytes, atomic: bool = False):
+        with self.lock:
+            self.files[name] = data
+
+    def exists(self, name: str) -> bool:
+        return name in self.files
+
+    def delete(self, name: str):
+        with self.lock:
+            self.files.pop(name, None)
+
+    def load_index(self) -> dict[str, str]:
+        return dict(self.index)
+
+    def save_index(self, hashes: dict[str, str]):
+        self.index = dict(hashes)
+
+    def pack_versions(self) -> PackVersions:
+        # Kept with the files, so deterministic builds don't touch the disk either
+        return self.versions
@@ -0,0 +1,59 @@
+import json
+import pathlib
+import uuid
+# If you have a linter/pylint, it will show these as errors but it works and I don't know how to remove the error
+from .util import info, warning, write_atomic, PACK_VERSIONS_PATH
+from .constants import GLOBAL_VERSION
+
+# All deterministic manifest uuids are derived from this one so they never collide with other tools
+MANIFEST_UUID_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "be-addon-creator")
+
+
+def manifest_uuid(namespace: str, pack: str, part: str) -> str:
+    """
+    Returns a uuid (v5) that only depends on the addon namespace, the pack ("behaviour"/"resources")
+    and the part of the manifest ("header"/"module")
+    """
+    return str(uuid.uuid5(MANIFEST_UUID_NAMESPACE, f"{namespace}/{pack}/{part}"))
+
+
+class PackVersions:
+    """
+    Remembers the content hash and version of every addon namespace so the version only
+    goes up when the pack contents change
+    """
+
+    path: pathlib.Path | None
+    versions: dict[str, dict]
+
+    def __init__(self, path: pathlib.Path | None = PACK_VERSIONS_PATH) -> None:
+        """
+        path: the json file they are saved in, None only keeps them in memory
+        """
+        self.path = path
+        self.versions = {}
+        if self.path is not None and self.path.exists():
+            try:
+                self.versions = dict(json.loads(self.path.read_text(encoding="utf-8")))
+            except ValueError:
+                warning("Ignoring unreadable pack versions '%s'", self.path)
+
+    def version_for(self, namespace: str, content_hash: str) -> list[int]:
+        """
+        Returns the version for the pack contents, bumping the patch version (and saving it)
+        if the contents changed since the last build
+        """
+        saved = self.versions.get(namespace)
+        if saved is None or list(saved["version"]) < GLOBAL_VERSION:
+            version = list(GLOBAL_VERSION)
+        elif saved["hash"] == content_hash:
+            return list(saved["version"])
+        else:
+            major, minor, patch = saved["version"]
+            version = [major, minor, patch + 1]
+            info("Pack contents changed, bumping version to %s", version)
+
+        self.versions[namespace] = {"hash": content_hash, "version": version}
+        if self.path is not None:
+            write_atomic(self.path, json.dumps(self.versions, indent=4))
+        return version
@@ -1,18 +1,36 @@
 # If you have a linter/pylint, it will show these as errors but it works and I don't know how to remove the error
 from .constants import FORMAT_VERSION_RECIPE
+from .recipe_compiler import normalize_pattern
+
+
+def namespaced(namespace: str, item_id: str) -> str:
+    """
+    Returns the namespaced id, ids without a namespace are the addons own items/blocks
+    (the game would read a bare id as a minecraft: one)
+    """
+    return item_id if ":" in item_id else f"{namespace}:{item_id}"
 
 class CraftingRecipeShaped:
     """
     A minecraft bedrock shaped crafting recipe
     """
 
+    __slots__ = (
+        "item_id",
+        "pattern",
+        "key",
+        "result_item_id",
+    )
+
     item_id: str
     pattern: list[str]
+    key: dict[str, str]
     result_item_id: str
 
     def __init__(self) -> None:
         self.item_id = ""
         self.pattern = []
+        self.key = {}
         self.result_item_id = ""
 
     def set_item_id(self, item_id: str):
@@ -24,11 +42,18 @@ class CraftingRecipeShaped:
 
     def set_pattern(self, pattern: list[str]):
         """
-        Set the shape of the recipe
+        Set the shape of the recipe, e.g. ["###", " | ", " | "] (see set_key for what the symbols are)
         """
         self.pattern = pattern
         return self
 
+    def set_key(self, key: dict[str, str]):
+        """
+        Set the item of every symbol in the pattern, e.g. {"#": "minecraft:planks", "|": "minecraft:stick"}
+        """
+        self.key = key
+        return self
+
     def set_result_item_id(self, result_item_id: str):
         """
         Set the result item of the recipe
@@ -38,18 +63,22 @@ class CraftingRecipeShaped:
 
     def construct(self, namespace: str) -> dict:
         """
-        Returns the shaped recipe json used inside a behaviour pack
+        Returns the shaped recipe json used inside a behaviour pack, the pattern is trimmed
+        and its symbols renamed (see recipe_compiler.normalize_pattern).
+        The result is result_item_id (item_id if it isn't set)
         """
+        pattern, key = normalize_pattern(self.pattern, self.key)
         return {
             "format_version": FORMAT_VERSION_RECIPE,
             "minecraft:recipe_shaped": {
                 "description": {"identifier": f"{namespace}:{self.item_id}"},
                 "tags": ["crafting_table"],
-                "pattern": self.pattern,
+                "pattern": pattern,
                 "key": {
-                    # TODO: work this out
+                    symbol: {"item": namespaced(namespace, item_id)}
+                    for symbol, item_id in key.items()
                 },
-                "result": f"{namespace}:{self.item_id}",
+                "result": namespaced(namespace, self.result_item_id or self.item_id),
             },
         }
 
@@ -58,6 +87,11 @@ class RecipeIngredient:
     A minecraft bedrock shapeless recipe ingredient
     """
 
+    __slots__ = (
+        "item_id",
+        "count",
+    )
+
     item_id: str
     count: int
 
@@ -78,6 +112,12 @@ class CraftingRecipeShapeless:
     A minecraft bedrock shapeless crafting recipe
     """
 
+    __slots__ = (
+        "item_id",
+        "ingredients",
+        "result_item_id",
+    )
+
     item_id: str
     ingredients: list[RecipeIngredient]
     result_item_id: str
@@ -0,0 +1,71 @@
+import hashlib
+import json
+# If you have a linter/pylint, it will show these as errors but it works and I don't know how to remove the error
+from .util import error
+
+# Canonical pattern symbols, a crafting grid has at most 9 different ingredients
+SYMBOLS = "ABCDEFGHI"
+MAX_PATTERN_SIZE = 3
+
+
+def normalize_pattern(
+    pattern: list[str], key: dict[str, str]
+) -> tuple[list[str], dict[str, str]]:
+    """
+    Trim the empty rows/columns around a shaped pattern and rename its symbols to A, B, C...
+    in reading order (one symbol per item), returns the new pattern and its key.
+    Recipes with the same shape and items always give the same result, whatever symbols they used
+    """
+    width = max((len(row) for row in pattern), default=0)
+    rows = [row.ljust(width) for row in pattern]
+    filled = [index for index, row in enumerate(rows) if row.strip()]
+    if not filled:
+        error("Shaped recipe pattern %s is empty", pattern)
+    rows = rows[filled[0] : filled[-1] + 1]
+    left = min(len(row) - len(row.lstrip()) for row in rows if row.strip())
+    right = max(len(row.rstrip()) for row in rows)
+    rows = [row[left:right] for row in rows]
+    if len(rows) > MAX_PATTERN_SIZE or right - left > MAX_PATTERN_SIZE:
+        error("Shaped recipe pattern %s is bigger than 3x3", pattern)
+
+    # Item -> its canonical symbol, in the order the items first appear
+    symbols: dict[str, str] = {}
+    normalized = []
+    for row in rows:
+        normalized_row = []
+        for symbol in row:
+            if symbol == " ":
+                normalized_row.append(symbol)
+                continue
+            item_id = key.get(symbol)
+            if item_id is None:
+                error(
+                    "Symbol '%s' of shaped recipe pattern %s isn't in its key",
+                    symbol,
+                    pattern,
+                )
+            normalized_row.append(symbols.setdefault(item_id, SYMBOLS[len(symbols)]))
+        normalized.append("".join(normalized_row))
+    return normalized, {symbol: item_id for item_id, symbol in symbols.items()}
+
+
+def _digest(data) -> str:
+    return hashlib.sha256(
+        json.dumps(data, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    ).hexdigest()
+
+
+def recipe_fingerprint(recipe) -> str:
+    """
+    Returns a hash of what a recipe uses and makes, equivalent recipes (e.g. the same shape with
+    other symbols or padding, or the same ingredients in another order) get the same fingerprint
+    """
+    # What the recipe makes, not its own id, so equivalent recipes with different ids match
+    result = recipe.result_item_id or recipe.item_id
+    if hasattr(recipe, "pattern"):
+        pattern, key = normalize_pattern(recipe.pattern, recipe.key)
+        return _digest(["shaped", pattern, key, result])
+    counts: dict[str, int] = {}
+    for ingredient in recipe.ingredients:
+        counts[ingredient.item_id] = counts.get(ingredient.item_id, 0) + ingredient.count
+    return _digest(["shapeless", sorted(counts.items()), result])
@@ -0,0 +1,202 @@
+import weakref
+from typing import Callable, Iterable
+# If you have a linter/pylint, it will show these as errors but it works and I don't know how to remove the error
+from .recipe import CraftingRecipeShapeless, CraftingRecipeShaped
+
+Recipe = CraftingRecipeShapeless | CraftingRecipeShaped
+
+# Told when an item/block gets a recipe (see on_recipe_set), weak so listening doesn't keep a manager alive
+_recipe_listeners: list[weakref.WeakMethod] = []
+
+
+def on_recipe_set(listener: Callable[[object], object]):
+    """
+    Call the (bound method) listener with every item/block set_recipe() is called on
+    """
+    _recipe_listeners.append(weakref.WeakMethod(listener))
+
+
+def recipe_set(content):
+    """
+    Called by Item.set_recipe/Block.set_recipe
+    """
+    for reference in list(_recipe_listeners):
+        listener = reference()
+        if listener is None:
+            _recipe_listeners.remove(reference)
+        else:
+            listener(content)
+
+
+def recipe_result(recipe: Recipe) -> str:
+    """
+    Returns the id the recipe makes
+    """
+    return recipe.result_item_id or recipe.item_id
+
+
+def recipe_ingredients(recipe: Recipe) -> list[str]:
+    """
+    Returns the ids the recipe uses
+    """
+    if isinstance(recipe, CraftingRecipeShapeless):
+        return [ingredient.item_id for ingredient in recipe.ingredients]
+    return [
+        recipe.key[symbol] for row in recipe.pattern for symbol in row if symbol in recipe.key
+    ]
+
+
+class RecipeGraph:
+    """
+    Which recipes use and make which items/blocks (by namespaced identifier), kept up to date
+    as recipes are added and removed. A recipe that is changed after it was added needs to be added again
+    """
+
+    # Dicts with None values are used as ordered sets, so queries return recipes in the order they were added
+    by_ingredient: dict[str, dict[Recipe, None]]
+    by_result: dict[str, dict[Recipe, None]]
+    edges: dict[Recipe, tuple[str, tuple[str, ...]]]
+
+    def __init__(
+        self, identifier: Callable[[str], str] = lambda content_id: content_id
+    ) -> None:
+        """
+        identifier: turns the ids used by recipes into namespaced identifiers (e.g. ContentRegistry.identifier)
+        """
+        self.identifier = identifier
+        self.by_ingredient = {}
+        self.by_result = {}
+        # The result and ingredients every recipe was added with, so removing it doesn't depend on its current fields
+        self.edges = {}
+
+    def add(self, recipe: Recipe):
+        """
+        Add a recipe (adding one that is already in the graph updates it)
+        """
+        if recipe in self.edges:
+            self.remove(recipe)
+        result = self.identifier(recipe_result(recipe))
+        # Each ingredient once, even if the recipe lists it more than once
+        ingredients = tuple(
+            dict.fromkeys(self.identifier(item) for item in recipe_ingredients(recipe))
+        )
+        self.edges[recipe] = (result, ingredients)
+        self.by_result.setdefault(result, {})[recipe] = None
+        for ingredient in ingredients:
+            self.by_ingredient.setdefault(ingredient, {})[recipe] = None
+
+    def remove(self, recipe: Recipe):
+        """
+        Remove a recipe (if it is in the graph)
+        """
+        if recipe not in self.edges:
+            return
+        result, ingredients = self.edges.pop(recipe)
+        self.__discard(self.by_result, result, recipe)
+        for ingredient in ingredients:
+            self.__discard(self.by_ingredient, ingredient, recipe)
+
+    def __discard(self, index: dict[str, dict[Recipe, None]], key: str, recipe: Recipe):
+        recipes = index[key]
+        del recipes[recipe]
+        if not recipes:
+            del index[key]
+
+    def used_by(self, content_id: str) -> list[Recipe]:
+        """
+        Returns the recipes that use the item/block as an ingredient (e.g. "minecraft:leather")
+        """
+        return list(self.by_ingredient.get(self.identifier(content_id), ()))
+
+    def made_by(self, content_id: str) -> list[Recipe]:
+        """
+        Returns the recipes that make the item/block
+        """
+        return list(self.by_result.get(self.identifier(content_id), ()))
+
+    def __len__(self) -> int:
+        return len(self.edges)
+
+    def cycles(self) -> list[list[str]]:
+        """
+        Returns every group of items/blocks that (indirectly) are ingredients of themselves, sorted
+        """
+        # Tarjan's strongly connected components, iterative so huge graphs don't hit the recursion limit
+        index: dict[str, int] = {}
+        lowlink: dict[str, int] = {}
+        stack: list[str] = []
+        on_stack: set[str] = set()
+        cycles = []
+        for root in self.by_ingredient:
+            if root in index:
+                continue
+            work = [(root, iter(self.__results_of(root)))]
+            index[root] = lowlink[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            while work:
+                node, results = work[-1]
+                for result in results:
+                    if result not in index:
+                        index[result] = lowlink[result] = len(index)
+                        stack.append(result)
+                        on_stack.add(result)
+                        work.append((result, iter(self.__results_of(result))))
+                        break
+                    if result in on_stack:
+                        lowlink[node] = min(lowlink[node], index[result])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[node])
+                    if lowlink[node] == index[node]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == node:
+                                break
+                        if len(component) > 1 or node in self.__results_of(node):
+                            cycles.append(sorted(component))
+        return sorted(cycles)
+
+    def __results_of(self, ingredient: str) -> dict[str, None]:
+        return {
+            self.edges[recipe][0]: None for recipe in self.by_ingredient.get(ingredient, ())
+        }
+
+    def unreachable(self, obtainable: Iterable[str] | None = None) -> list[str]:
+        """
+        Returns the items/blocks recipes make that can't be crafted starting from the obtainable ones
+        (by default everything no recipe makes, e.g. vanilla items), like the ones only made through a cycle
+        """
+        if obtainable is None:
+            reachable = [
+                ingredient
+                for ingredient in self.by_ingredient
+                if ingredient not in self.by_result
+            ]
+        else:
+            reachable = list(
+                dict.fromkeys(self.identifier(content_id) for content_id in obtainable)
+            )
+        # Ingredients every recipe still needs, a recipe can be crafted once it needs none
+        missing = {
+            recipe: len(ingredients) for recipe, (_, ingredients) in self.edges.items()
+        }
+        seen = set(reachable)
+        for recipe, count in missing.items():
+            if count == 0 and self.edges[recipe][0] not in seen:
+                seen.add(self.edges[recipe][0])
+                reachable.append(self.edges[recipe][0])
+        while reachable:
+            content_id = reachable.pop()
+            for recipe in self.by_ingredient.get(content_id, ()):
+                missing[recipe] -= 1
+                result = self.edges[recipe][0]
+                if missing[recipe] == 0 and result not in seen:
+                    seen.add(result)
+                    reachable.append(result)
+        return sorted(result for result in self.by_result if result not in seen)
@@ -0,0 +1,160 @@
+# If you have a linter/pylint, it will show these as errors but it works and I don't know how to remove the error
+from .util import error
+from .item import Item
+from .block import Block
+from .entity import Entity
+from .tables import ContentTable, ItemTable, BlockTable
+
+
+class ContentRegistry:
+    """
+    The items, blocks and entities of an addon by their namespaced identifier (e.g. "namespace:id").
+    They share one set of identifiers, so an item and a block can't both be "namespace:ruby"
+    """
+
+    namespace: str
+    items: dict[str, Item]
+    blocks: dict[str, Block]
+    entities: dict[str, Entity]
+
+    def __init__(self, namespace: str) -> None:
+        self.namespace = namespace
+        # Dicts keep insertion order, so generating still follows the order things were added in
+        self.items = {}
+        self.blocks = {}
+        self.entities = {}
+        self.content: dict[str, Item | Block | Entity] = {}
+        # Tables are checked for collisions when they are added, their rows are looked up through their index
+        self.item_tables: list[ItemTable] = []
+        self.block_tables: list[BlockTable] = []
+
+    def identifier(self, content_id: str) -> str:
+        """
+        Returns the namespaced identifier, ids without a namespace get the addons namespace
+        """
+        return content_id if ":" in content_id else f"{self.namespace}:{content_id}"
+
+    def __kind(self, content: Item | Block | Entity) -> dict:
+        if isinstance(content, Item):
+            return self.items
+        if isinstance(content, Block):
+            return self.blocks
+        if isinstance(content, Entity):
+            return self.entities
+        raise TypeError(f"Can't register {type(content).__name__}")
+
+    def add(self, content: Item | Block | Entity) -> str:
+        """
+        Register an item/block/entity, its identifier must not be used yet
+        """
+        identifier = self.identifier(content.id)
+        existing = self.content.get(identifier)
+        if existing is None:
+            existing = self.__table_row(identifier)
+        if existing is not None:
+            error(
+                f"Duplicate identifier '{identifier}' ({type(content).__name__.lower()}), "
+                f"it is already used by a registered {type(existing).__name__.lower()}"
+            )
+        self.__kind(content)[identifier] = content
+        self.content[identifier] = content
+        return identifier
+
+    def add_table(self, table: ContentTable) -> int:
+        """
+        Register an item/block table, none of its ids may be used yet. Returns the number of rows
+        """
+        duplicates = table.duplicates()
+        if duplicates:
+            error(f"Duplicate ids in {type(table).__name__}: {', '.join(duplicates[:10])}")
+        for content_id in table.index:
+            identifier = self.identifier(content_id)
+            if identifier in self.content or self.__table_row(identifier) is not None:
+                error(
+                    f"Duplicate identifier '{identifier}' ({type(table).__name__} row), "
+                    "it is already used"
+                )
+        if isinstance(table, ItemTable):
+            self.item_tables.append(table)
+        elif isinstance(table, BlockTable):
+            self.block_tables.append(table)
+        else:
+            raise TypeError(f"Can't register {type(table).__name__}")
+        return len(table)
+
+    def __find_table_row(self, identifier: str) -> tuple[ContentTable, int] | None:
+        """
+        Returns the table and row number of the table row with the identifier, or None
+        """
+        namespace, _, content_id = identifier.partition(":")
+        if namespace != self.namespace:
+            return None
+        for table in [*self.item_tables, *self.block_tables]:
+            row = table.index.get(content_id)
+            if row is not None:
+                return table, row
+        return None
+
+    def __table_row(self, identifier: str) -> Item | Block | None:
+        """
+        Returns the table row with the identifier as a new Item/Block, or None
+        """
+        found = self.__find_table_row(identifier)
+        return None if found is None else found[0].get(found[1])
+
+    def __remove_table_row(self, identifier: str) -> Item | Block | None:
+        """
+        Remove the table row with the identifier and return it as a new Item/Block, or None
+        """
+        found = self.__find_table_row(identifier)
+        return None if found is None else found[0].remove(found[1])
+
+    def get(self, content_id: str) -> Item | Block | Entity | None:
+        """
+        Returns the item/block/entity with the (namespaced) id, or None.
+        Table rows are returned as a copy, changing it doesn't change the table
+        """
+        identifier = self.identifier(content_id)
+        content = self.content.get(identifier)
+        return self.__table_row(identifier) if content is None else content
+
+    def remove(self, content_id: str) -> Item | Block | Entity:
+        """
+        Remove the item/block/entity with the (namespaced) id and return it
+        (table rows are removed from their table, O(1) on average see ContentTable.remove,
+        and returned as a new Item/Block)
+        """
+        identifier = self.identifier(content_id)
+        content = self.content.pop(identifier, None)
+        if content is None:
+            content = self.__remove_table_row(identifier)
+            if content is None:
+                error(f"Can't remove '{identifier}', nothing with that identifier exists")
+            return content
+        del self.__kind(content)[identifier]  # type: ignore
+        return content  # type: ignore
+
+    def replace(self, content: Item | Block | Entity) -> Item | Block | Entity | None:
+        """
+        Put an item/block/entity in place of the one with the same identifier (keeping its position),
+        returns the replaced one (None if there wasn't one).
+        A table row is taken out of its table, the new one is kept as an object
+        """
+        identifier = self.identifier(content.id)
+        existing = self.content.get(identifier)
+        if existing is None:
+            existing = self.__remove_table_row(identifier)
+        elif type(existing) is not type(content):
+            # Changing the kind moves it to the end of its new kind
+            del self.__kind(existing)[identifier]
+        self.__kind(content)[identifier] = content
+        self.content[identifier] = content
+        return existing
+
+    def __contains__(self, content_id: str) -> bool:
+        return self.get(content_id) is not None
+
+    def __len__(self) -> int:
+        return len(self.content) + sum(
+            len(table) for table in [*self.item_tables, *self.block_tables]
+        )
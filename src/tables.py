@@ -0,0 +1,227 @@
+import array
+import enum
+import inspect
+import types
+import typing
+from typing import Iterable, Iterator
+# If you have a linter/pylint, it will show these as errors but it works and I don't know how to remove the error
+from .util import error
+from .item import Item
+from .block import Block
+
+# Fields that stay per object, tables are for plain rows
+SKIPPED_FIELDS = ("translations", "recipe")
+
+
+def _is_number(annotation) -> bool:
+    """
+    int | float fields (e.g. hardness)
+    """
+    return isinstance(annotation, types.UnionType) and set(
+        typing.get_args(annotation)
+    ) == {int, float}
+
+
+class ContentTable:
+    """
+    Stores many items/blocks as one column per field instead of one object per row,
+    enum columns hold small integer codes.
+    Rows can't have translations or recipes, use Item/Block for those
+    """
+
+    content_type: type = object
+
+    def __init__(self) -> None:
+        defaults = self.content_type()
+        self.fields: dict[str, object] = {}
+        self.columns: dict[str, list | array.array] = {}
+        self.defaults: dict[str, object] = {}
+        # Enum members by code and codes by member for every enum column
+        self.members: dict[str, list[enum.Enum]] = {}
+        self.codes: dict[str, dict[enum.Enum, int]] = {}
+        # For int | float columns: which rows hold a float, so 2.0 and 2 are written like the Item/Block would
+        self.is_float: dict[str, array.array] = {}
+        for field, annotation in typing.get_type_hints(self.content_type).items():
+            if field in SKIPPED_FIELDS:
+                continue
+            self.fields[field] = annotation
+            self.columns[field] = self.__column(annotation)
+            if _is_number(annotation):
+                self.is_float[field] = array.array("b")
+            self.defaults[field] = getattr(defaults, field)
+            if inspect.isclass(annotation) and issubclass(annotation, enum.Enum):
+                self.members[field] = list(annotation)
+                self.codes[field] = {
+                    member: code for code, member in enumerate(annotation)
+                }
+        self.__index: dict[str, int] | None = None
+        # Rows taken out with remove(), their values stay in the columns until the table is compacted
+        self.__removed: set[int] = set()
+
+    def __column(self, annotation) -> list | array.array:
+        if inspect.isclass(annotation) and issubclass(annotation, enum.Enum):
+            return array.array("B")
+        if annotation is bool:
+            return array.array("b")
+        if annotation is int:
+            return array.array("q")
+        if _is_number(annotation):
+            return array.array("d")
+        # Text (ids, names, texture paths) stays a list
+        return []
+
+    def __encode(self, field: str, value):
+        if field in self.codes:
+            # Accepts the member or its value (e.g. CreativeCategory.NATURE or "Nature")
+            return self.codes[field][self.fields[field](value)]  # type: ignore
+        return value
+
+    def __decode(self, field: str, row: int):
+        value = self.columns[field][row]
+        if field in self.members:
+            return self.members[field][value]
+        if self.fields[field] is bool:
+            return bool(value)
+        if field in self.is_float and not self.is_float[field][row]:
+            return int(value)
+        return value
+
+    def append(self, **fields) -> int:
+        """
+        Add a row, fields that aren't given use the Item/Block defaults. Returns the row number.
+        food=bars works like Item.set_food
+        """
+        if "food" in fields:
+            fields["is_food"] = True
+            fields["food_bars"] = fields.pop("food")
+        unknown = fields.keys() - self.fields.keys()
+        if unknown:
+            unknown_fields = ", ".join(sorted(unknown))
+            error(f"Unknown {self.content_type.__name__} table fields: {unknown_fields}")
+        row = len(self.columns["id"])
+        try:
+            for field, column in self.columns.items():
+                value = fields.get(field, self.defaults[field])
+                column.append(self.__encode(field, value))
+                if field in self.is_float:
+                    self.is_float[field].append(isinstance(value, float))
+        except Exception:
+            # A bad value (e.g. an unknown enum value or text in a number column) must not leave
+            # the columns it already reached one row longer than the others
+            for column in [*self.columns.values(), *self.is_float.values()]:
+                del column[row:]
+            raise
+        if self.__index is not None:
+            self.__index.setdefault(self.columns["id"][row], row)
+        return row
+
+    def extend(self, rows: Iterable[dict]) -> int:
+        """
+        Add every row of an iterable (of dicts with the fields), returns the number of rows in the table
+        """
+        for fields in rows:
+            self.append(**fields)
+        return len(self)
+
+    def __len__(self) -> int:
+        return len(self.columns["id"]) - len(self.__removed)
+
+    def rows(self) -> range | list[int]:
+        """
+        The row numbers of the rows that weren't removed, in order
+        """
+        if not self.__removed:
+            return range(len(self.columns["id"]))
+        return [row for row in range(len(self.columns["id"])) if row not in self.__removed]
+
+    @property
+    def index(self) -> dict[str, int]:
+        """
+        Row number by id, built the first time it's needed (the first row wins for duplicate ids)
+        """
+        if self.__index is None:
+            self.__index = {}
+            ids = self.columns["id"]
+            for row in self.rows():
+                self.__index.setdefault(ids[row], row)  # type: ignore
+        return self.__index
+
+    def duplicates(self) -> list[str]:
+        """
+        Returns the ids that are used by more than one row
+        """
+        return sorted(
+            {
+                self.columns["id"][row]
+                for row in self.rows()
+                if self.index[self.columns["id"][row]] != row  # type: ignore
+            }
+        )
+
+    def fill(self, row: int, content):
+        """
+        Copy the row into an existing Item/Block and return it
+        """
+        for field in self.columns:
+            setattr(content, field, self.__decode(field, row))
+        return content
+
+    def get(self, row: int):
+        """
+        Returns the row as a new Item/Block
+        """
+        return self.fill(row, self.content_type())
+
+    def remove(self, row: int):
+        """
+        Remove a row and return it as a new Item/Block. The row is only marked as removed (O(1)),
+        once more than half of the rows are removed the columns are compacted (O(rows), so O(1)
+        per removal on average) which gives the rows after removed ones new row numbers
+        """
+        if row in self.__removed or not 0 <= row < len(self.columns["id"]):
+            error(f"{type(self).__name__} has no row {row}")
+        content = self.get(row)
+        self.__removed.add(row)
+        if self.__index is not None and self.__index.get(content.id) == row:
+            del self.__index[content.id]
+        if len(self.__removed) * 2 > len(self.columns["id"]):
+            self.__compact()
+        return content
+
+    def __compact(self):
+        rows = self.rows()
+        for columns in (self.columns, self.is_float):
+            for field, column in columns.items():
+                values = [column[row] for row in rows]
+                columns[field] = (
+                    array.array(column.typecode, values)
+                    if isinstance(column, array.array)
+                    else values
+                )
+        self.__removed = set()
+        self.__index = None
+
+    def flyweights(self) -> Iterator:
+        """
+        Yields every row in order as one reused Item/Block, so constructing a whole table
+        doesn't create an object per row. Don't keep the yielded object around
+        """
+        content = self.content_type()
+        for row in self.rows():
+            yield self.fill(row, content)
+
+
+class ItemTable(ContentTable):
+    """
+    Columns for many items, see ContentTable
+    """
+
+    content_type = Item
+
+
+class BlockTable(ContentTable):
+    """
+    Columns for many blocks, see ContentTable
+    """
+
+    content_type = Block
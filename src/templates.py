@@ -0,0 +1,150 @@
+import enum
+import inspect
+import json
+import types
+import typing
+# If you have a linter/pylint, it will show these as errors but it works and I don't know how to remove the error
+from .item import Item
+from .block import Block
+from .json_profile import JsonProfile, encode_json, orjson
+
+# The classes that get templates and the fields that change the shape of their json
+# (e.g. food items have extra components), every combination of those gets its own template
+TEMPLATE_CLASSES: dict[type, tuple[str, ...]] = {
+    Item: ("is_food",),
+    Block: (),
+}
+
+# Values that are written the same inside a template as by json.dumps on the whole document
+SCALAR_TYPES = (str, int, float, bool, type(None))
+
+
+def _marker(field: str) -> str:
+    return f"\0{field}\0"
+
+
+class JsonTemplate:
+    """
+    The json of a construct() call with holes for the fields, the constant parts are encoded once
+    """
+
+    parts: list[str]
+    holes: list[tuple[str, bool, bool]]
+
+    def __init__(
+        self,
+        cls: type,
+        namespace: str,
+        shape: dict[str, object],
+        profile: JsonProfile = JsonProfile.PRETTY,
+    ) -> None:
+        hints = typing.get_type_hints(cls)
+        self.enum_fields = {
+            field
+            for field, annotation in hints.items()
+            if inspect.isclass(annotation) and issubclass(annotation, enum.Enum)
+        }
+        # A stand in object whose fields are markers, construct() copies them into the json
+        probe = types.SimpleNamespace()
+        for field in cls.__slots__:
+            marker = _marker(field)
+            if field in shape:
+                setattr(probe, field, shape[field])
+            elif field in self.enum_fields:
+                setattr(probe, field, types.SimpleNamespace(value=marker))
+            else:
+                setattr(probe, field, marker)
+        text = encode_json(cls.construct(probe, namespace), profile)
+
+        self.parts = []
+        # (field, is the whole value, is an enum)
+        self.holes = []
+        # The encoder writes the \0 around the markers as \u0000
+        pieces = text.split("\\u0000")
+        current = pieces[0]
+        for index in range(1, len(pieces), 2):
+            field, after = pieces[index], pieces[index + 1]
+            whole_value = current.endswith('"') and after.startswith('"')
+            if whole_value:
+                current, after = current[:-1], after[1:]
+            self.parts.append(current)
+            self.holes.append((field, whole_value, field in self.enum_fields))
+            current = after
+        self.parts.append(current)
+
+    def render(self, obj) -> str | None:
+        """
+        Returns the json of obj.construct(), or None if a field has a value the template can't write
+        """
+        out = [self.parts[0]]
+        for (field, whole_value, is_enum), part in zip(self.holes, self.parts[1:]):
+            value = getattr(obj, field)
+            if is_enum:
+                value = value.value
+            if whole_value:
+                if not isinstance(value, SCALAR_TYPES):
+                    return None
+                out.append(json.dumps(value))
+            else:
+                # Inside a string, e.g. "namespace:(id)"
+                out.append(json.dumps(f"{value}")[1:-1])
+            out.append(part)
+        return "".join(out)
+
+
+class TemplateCache:
+    """
+    Compiled templates of one namespace and json profile, compiled the first time each class/shape is encoded
+    """
+
+    namespace: str
+    profile: JsonProfile
+    templates: dict[tuple, JsonTemplate]
+
+    def __init__(
+        self, namespace: str, profile: JsonProfile = JsonProfile.PRETTY
+    ) -> None:
+        self.namespace = namespace
+        self.profile = profile
+        self.templates = {}
+
+    def encode(self, obj) -> str:
+        """
+        Returns the same text as encode_json(obj.construct(namespace), profile)
+        """
+        shape_fields = TEMPLATE_CLASSES.get(type(obj))
+        if shape_fields is not None:
+            shape = tuple(getattr(obj, field) for field in shape_fields)
+            key = (type(obj), shape)
+            template = self.templates.get(key)
+            if template is None:
+                template = JsonTemplate(
+                    type(obj),
+                    self.namespace,
+                    dict(zip(shape_fields, shape)),
+                    self.profile,
+                )
+                self.templates[key] = template
+            text = template.render(obj)
+            if text is not None:
+                return text
+        return encode_json(obj.construct(self.namespace), self.profile)
+
+
+# One cache per namespace and profile, also inside the construct worker processes
+_caches: dict[tuple[str, JsonProfile], TemplateCache] = {}
+
+
+def encode_construct(
+    namespace: str, obj, profile: JsonProfile = JsonProfile.PRETTY
+) -> str:
+    """
+    Returns encode_json(obj.construct(namespace), profile) using a precompiled template when there is one
+    """
+    if profile is JsonProfile.FAST and orjson is not None:
+        # orjson encodes the whole object faster than a template can be filled in
+        return encode_json(obj.construct(namespace), profile)
+    cache = _caches.get((namespace, profile))
+    if cache is None:
+        cache = _caches[namespace, profile] = TemplateCache(namespace, profile)
+    return cache.encode(obj)
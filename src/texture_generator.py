@@ -0,0 +1,141 @@
+import enum
+import hashlib
+import struct
+import zlib
+# NumPy is optional, it is only needed to generate textures
+try:
+    import numpy
+except ImportError:
+    numpy = None
+# If you have a linter/pylint, it will show these as errors but it works and I don't know how to remove the error
+from .util import error
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+SIZES = (16, 32)
+
+
+class TextureStyle(enum.Enum):
+    """
+    How generated placeholder textures look, every item/block gets its own color (from its id)
+    """
+
+    # One flat color
+    SOLID = "solid"
+    # The color fading to a darker shade from top to bottom
+    GRADIENT = "gradient"
+    # A grayscale base image (a beveled tile by default) tinted with the color
+    TINTED = "tinted"
+
+
+def _png_chunk(kind: bytes, data: bytes) -> bytes:
+    return (
+        struct.pack(">I", len(data))
+        + kind
+        + data
+        + struct.pack(">I", zlib.crc32(kind + data))
+    )
+
+
+def encode_png(image) -> bytes:
+    """
+    Returns an 8 bit RGBA image (a height x width x 4 uint8 array) as a PNG file
+    """
+    height, width = image.shape[:2]
+    # Every row starts with its filter type, 0 (none)
+    rows = numpy.zeros((height, 1 + width * 4), dtype=numpy.uint8)
+    rows[:, 1:] = image.reshape(height, width * 4)
+    return b"".join(
+        (
+            PNG_SIGNATURE,
+            _png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)),
+            _png_chunk(b"IDAT", zlib.compress(rows.tobytes(), 9)),
+            _png_chunk(b"IEND", b""),
+        )
+    )
+
+
+class TextureGenerator:
+    """
+    Makes placeholder textures for items/blocks that don't have one,
+    the textures of a whole batch are made at once as one NumPy array
+    """
+
+    style: TextureStyle
+    size: int
+
+    def __init__(
+        self, style: TextureStyle = TextureStyle.SOLID, size: int = 16, base=None
+    ) -> None:
+        """
+        style: solid, gradient or tinted (see TextureStyle)
+        size: 16 or 32 (pixels)
+        base: the image tinted textures start from, a size x size array of gray values (0-255)
+            or of RGB(A) pixels (only their brightness and alpha are used)
+        """
+        if numpy is None:
+            error("Generating textures needs NumPy, install it with 'pip install numpy'")
+        if size not in SIZES:
+            error("Generated textures must be 16 or 32 pixels, not %s", size)
+        self.style = TextureStyle(style)
+        self.size = size
+        self.base = self.__base(base)
+
+    def __base(self, base):
+        """
+        Returns the base as size x size x 2 floats, brightness (0-1) and alpha (0-255)
+        """
+        if base is None:
+            # A tile with a light top/left and a dark bottom/right edge
+            brightness = numpy.full((self.size, self.size), 0.8)
+            edge = max(1, self.size // 16)
+            brightness[:edge, :] = brightness[:, :edge] = 1.0
+            brightness[-edge:, :] = brightness[:, -edge:] = 0.55
+            alpha = numpy.full((self.size, self.size), 255.0)
+            return numpy.stack((brightness, alpha), axis=-1)
+        base = numpy.asarray(base, dtype=numpy.float64)
+        if base.shape[:2] != (self.size, self.size):
+            error("The base texture must be %dx%d pixels", self.size, self.size)
+        if base.ndim == 2:
+            return numpy.stack((base / 255, numpy.full(base.shape, 255.0)), axis=-1)
+        alpha = base[..., 3] if base.shape[2] == 4 else numpy.full(base.shape[:2], 255.0)
+        return numpy.stack((base[..., :3].mean(axis=-1) / 255, alpha), axis=-1)
+
+    def colors(self, ids: list[str]):
+        """
+        Returns the RGB color of every id as an n x 3 array, the same id always gets the same color
+        """
+        digests = b"".join(
+            hashlib.sha256(content_id.encode("utf-8")).digest()[:3] for content_id in ids
+        )
+        colors = numpy.frombuffer(digests, dtype=numpy.uint8).reshape(len(ids), 3)
+        # Keep them away from black so the shading stays visible
+        return 64 + colors.astype(numpy.float64) * 0.75
+
+    def images(self, ids: list[str]):
+        """
+        Returns the textures of every id as one n x size x size x 4 (RGBA) uint8 array
+        """
+        count = len(ids)
+        colors = self.colors(ids)[:, None, None, :]
+        shape = (count, self.size, self.size)
+        images = numpy.empty((*shape, 4), dtype=numpy.uint8)
+        if self.style is TextureStyle.SOLID:
+            images[..., :3] = numpy.broadcast_to(colors, (*shape, 3))
+            images[..., 3] = 255
+        elif self.style is TextureStyle.GRADIENT:
+            shade = numpy.linspace(1.0, 0.5, self.size)[None, :, None, None]
+            images[..., :3] = numpy.broadcast_to(colors * shade, (*shape, 3))
+            images[..., 3] = 255
+        else:
+            brightness = self.base[None, :, :, 0:1]
+            images[..., :3] = numpy.clip(colors * brightness, 0, 255)
+            images[..., 3] = self.base[None, :, :, 1]
+        return images
+
+    def generate(self, ids: list[str]) -> list[bytes]:
+        """
+        Returns a PNG file for every id, in the same order
+        """
+        if not ids:
+            return []
+        return [encode_png(image) for image in self.images(ids)]
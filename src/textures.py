@@ -0,0 +1,72 @@
+import hashlib
+import pathlib
+# If you have a linter/pylint, it will show these as errors but it works and I don't know how to remove the error
+from .util import error
+
+# Texture paths with one of these suffixes are source images that get copied into the pack,
+# anything else (e.g. "textures/blocks/stone") is used in the atlas as it is
+IMAGE_SUFFIXES = (".png", ".tga", ".jpg", ".jpeg")
+
+
+def is_source_image(texture_path: str) -> bool:
+    """
+    Returns if the texture path is an image file to copy into the pack instead of a path inside the pack
+    """
+    return pathlib.PurePath(texture_path).suffix.lower() in IMAGE_SUFFIXES
+
+
+class TextureStore:
+    """
+    Collects the source images of items/blocks for the resource pack by their content hash,
+    so an image used by many items/blocks is only copied once and they share its atlas path
+    """
+
+    # Path inside the resource pack (e.g. "textures/items/(hash).png") -> (source image, content hash)
+    # for every distinct image of this build
+    files: dict[str, tuple[pathlib.Path, str]]
+
+    def __init__(self) -> None:
+        self.files = {}
+        # Ids of the items/blocks that use the default texture path, by texture folder (for generated textures)
+        self.missing: dict[str, list[str]] = {}
+        # Content hash by (path, modification time, size), images that didn't change aren't read again
+        self.digests: dict[tuple[pathlib.Path, int, int], str] = {}
+
+    def start(self):
+        """
+        Forget the images of the last build
+        """
+        self.files = {}
+        self.missing = {}
+
+    def digest(self, source: pathlib.Path) -> str:
+        """
+        Returns the sha256 of the image
+        """
+        try:
+            stat = source.stat()
+        except OSError:
+            error("Texture '%s' doesn't exist", source)
+        key = (source.resolve(), stat.st_mtime_ns, stat.st_size)
+        digest = self.digests.get(key)
+        if digest is None:
+            digest = self.digests[key] = hashlib.sha256(source.read_bytes()).hexdigest()
+        return digest
+
+    def add(self, folder: str, texture_path: str) -> str:
+        """
+        Add a source image to textures/(folder) (e.g. "items") and return its path for the atlas
+        """
+        source = pathlib.Path(texture_path)
+        digest = self.digest(source)
+        # Named by the content so identical images end up as one file
+        texture = f"textures/{folder}/{digest[:16]}"
+        self.files.setdefault(f"{texture}{source.suffix.lower()}", (source, digest))
+        return texture
+
+    def add_missing(self, folder: str, content_id: str) -> str:
+        """
+        Remember an item/block without a texture, returns its default path for the atlas (textures/(folder)/(id))
+        """
+        self.missing.setdefault(folder, []).append(content_id)
+        return f"textures/{folder}/{content_id}"
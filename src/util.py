@@ -1,20 +1,96 @@
 import os, pathlib
+import json
+import logging
+from typing import NoReturn, TextIO
 
 # TODO: maybe have some kind of config?
 #      or use defaults.json to let users
 #      choose out directory?
 OUT_DIRECTORY = pathlib.Path("./out")
 DEFAULTS_PATH = pathlib.Path("./defaults.json")
+# Kept outside of the out folder so versions survive a clean build
+PACK_VERSIONS_PATH = pathlib.Path("./pack_versions.json")
 
 
-def error(message: str):
-    print(f"ERROR: {message}")
-    os._exit(1)
+class AddonError(Exception):
+    """
+    A bad definition or a problem while building, raised by error() so programs using the AddonManager can catch it
+    """
+
+
+def error(message: str, *args) -> NoReturn:
+    """
+    Raise an AddonError, the message is formatted with the args like log messages are (message % args)
+    """
+    raise AddonError(message % args if args else message)
+
+class BuildCancelled(Exception):
+    """
+    Raised inside a build that was cancelled (e.g. AddonManager.generate_async being cancelled)
+    """
+
+
+# Nothing below warnings is shown until configure_logging() is called
+logger = logging.getLogger("addon_manager")
+
+# Messages are only formatted (message % args) when their level is shown, so hidden ones cost nothing
+def debug(message: str, *args):
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(message, *args)
+
+def info(message: str, *args):
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(message, *args)
+
+def warning(message: str, *args):
+    if logger.isEnabledFor(logging.WARNING):
+        logger.warning(message, *args)
+
+
+class StructuredFormatter(logging.Formatter):
+    """
+    Writes every log message as one json object per line
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": record.created,
+            "level": record.levelname.lower(),
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry)
+
+
+def configure_logging(
+    level: str | int = "info",
+    quiet: bool = False,
+    structured: bool = False,
+    stream: TextIO | None = None,
+):
+    """
+    Show the log messages of the AddonManager on stream (stderr by default).
+    level: "debug", "info", "warning" or "error", quiet only shows errors and
+    structured writes json lines instead of text (e.g. for CI logs)
+    """
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(
+        StructuredFormatter()
+        if structured
+        else logging.Formatter("%(levelname)s: %(message)s")
+    )
+    logger.handlers = [handler]
+    logger.propagate = False
+    logger.setLevel(
+        logging.ERROR if quiet else level.upper() if isinstance(level, str) else level
+    )
 
-DEBUG = True
-def debug(message: str):
+def write_atomic(path: pathlib.Path, data: str | bytes):
     """
-    DEBUG
+    Write to a file through a temporary file so a failed write never leaves a half written file behind
     """
-    if DEBUG:
-        print(f"DEBUG: {message}")
\ No newline at end of file
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f".{path.name}.tmp")
+    temp_path.write_bytes(data.encode("utf-8") if isinstance(data, str) else data)
+    os.replace(temp_path, path)
@@ -0,0 +1,309 @@
+import enum
+import functools
+import inspect
+import pathlib
+import re
+import typing
+# If you have a linter/pylint, it will show these as errors but it works and I don't know how to remove the error
+from .util import AddonError, warning
+from .lang import DEFAULT_LANGUAGE
+from .textures import is_source_image
+from .item import Item
+from .block import Block
+from .entity import Entity
+from .recipe import CraftingRecipeShapeless, CraftingRecipeShaped
+from .recipe_compiler import recipe_fingerprint
+from .recipe_graph import recipe_ingredients, recipe_result
+from .vanilla import NAMESPACE as VANILLA_NAMESPACE, vanilla_catalog
+
+# Ids are lowercase letters, digits, "_", "." and "-" (they are used as file names too),
+# references to other items/blocks may have a namespace ("minecraft:stick")
+ID_PATTERN = re.compile(r"[a-z0-9_][a-z0-9_.\-]*")
+IDENTIFIER_PATTERN = re.compile(r"(?:[a-z0-9_][a-z0-9_.\-]*:)?[a-z0-9_][a-z0-9_.\-]*")
+HEX_COLOR_PATTERN = re.compile(r"#[0-9a-fA-F]{6}")
+
+# Lowest and highest allowed value of the number fields (None has no limit)
+RANGES: dict[type, dict[str, tuple[int | None, int | None]]] = {
+    Item: {"max_stack_size": (1, 64), "food_bars": (0, None), "use_duration": (0, None)},
+    Block: {"hardness": (0, None), "resistance": (0, None)},
+}
+
+Recipe = CraftingRecipeShapeless | CraftingRecipeShaped
+
+
+@functools.cache
+def _enum_fields(cls: type) -> dict[str, type[enum.Enum]]:
+    """
+    The fields of an Item/Block that hold an enum member (e.g. category)
+    """
+    return {
+        field: annotation
+        for field, annotation in typing.get_type_hints(cls).items()
+        if inspect.isclass(annotation) and issubclass(annotation, enum.Enum)
+    }
+
+
+class ValidationIssue:
+    """
+    One problem with a definition, e.g. a recipe using an item that doesn't exist
+    """
+
+    subject: str
+    message: str
+
+    def __init__(self, subject: str, message: str) -> None:
+        self.subject = subject
+        self.message = message
+
+    def __str__(self) -> str:
+        return f"{self.subject}: {self.message}"
+
+    def __repr__(self) -> str:
+        return f"ValidationIssue({self})"
+
+
+class ValidationReport:
+    """
+    Every problem validate_addon() found (all of them, not just the first)
+    """
+
+    issues: list[ValidationIssue]
+
+    def __init__(self) -> None:
+        self.issues = []
+
+    def add(self, subject: str, message: str, *args):
+        self.issues.append(ValidationIssue(subject, message % args if args else message))
+
+    @property
+    def ok(self) -> bool:
+        return not self.issues
+
+    def __len__(self) -> int:
+        return len(self.issues)
+
+    def __str__(self) -> str:
+        return "\n".join(str(issue) for issue in self.issues)
+
+    def __repr__(self) -> str:
+        return f"ValidationReport(issues={len(self.issues)})"
+
+
+class Validator:
+    """
+    Checks all definitions of an AddonManager in one pass before anything is written:
+    id syntax, references between recipes and items/blocks, value ranges/enums,
+    spawn egg colors, texture files and lang keys that collide with custom ones
+    """
+
+    def __init__(self, manager) -> None:
+        self.registry = manager.registry
+        self.namespace = manager.namespace
+        self.recipes: list[Recipe] = manager.recipes
+        self.custom_lang = manager.custom_lang.languages
+        self.vanilla = manager.vanilla
+        self.allow_unknown_vanilla = manager.allow_unknown_vanilla
+        self.report = ValidationReport()
+        # Recipe file (its id) -> fingerprint of the recipe written there
+        self.recipe_files: dict[str, str] = {}
+
+    def run(self) -> ValidationReport:
+        for item in self.registry.items.values():
+            self.__check_content(item, "item")
+        for block in self.registry.blocks.values():
+            self.__check_content(block, "tile")
+        for table in [*self.registry.item_tables, *self.registry.block_tables]:
+            self.__check_table(table)
+        for entity in self.registry.entities.values():
+            self.__check_entity(entity)
+        # Each recipe once, it may be both added and set on its item/block
+        recipes = {id(recipe): recipe for recipe in self.recipes}
+        for content in [*self.registry.items.values(), *self.registry.blocks.values()]:
+            if content.recipe is not None:
+                recipes.setdefault(id(content.recipe), content.recipe)
+        for recipe in recipes.values():
+            self.__check_recipe(recipe)
+        return self.report
+
+    def __check_id(self, subject: str, content_id: str) -> bool:
+        if isinstance(content_id, str) and ID_PATTERN.fullmatch(content_id) is not None:
+            return True
+        self.report.add(
+            subject,
+            "id %r must be lowercase letters, digits, '_', '.' or '-' (without a namespace)",
+            content_id,
+        )
+        return False
+
+    def __check_lang_key(self, subject: str, key: str, language: str = DEFAULT_LANGUAGE):
+        if key in self.custom_lang.get(language, ()):
+            self.report.add(
+                subject,
+                "lang key '%s' (%s) is also added with add_translation()",
+                key,
+                language,
+            )
+
+    def __check_value(self, subject: str, field: str, value, low, high):
+        if (
+            isinstance(value, bool)
+            or not isinstance(value, (int, float))
+            or (low is not None and value < low)
+            or (high is not None and value > high)
+        ):
+            limits = f"at least {low}" if high is None else f"between {low} and {high}"
+            self.report.add(subject, "%s must be %s, not %r", field, limits, value)
+
+    def __check_texture(self, subject: str, texture_path: str | None):
+        if (
+            texture_path is not None
+            and is_source_image(texture_path)
+            and not pathlib.Path(texture_path).is_file()
+        ):
+            self.report.add(subject, "texture '%s' doesn't exist", texture_path)
+
+    def __check_content(self, content: Item | Block, lang_prefix: str):
+        kind = type(content).__name__.lower()
+        subject = f"{kind} '{self.registry.identifier(content.id)}'"
+        self.__check_id(subject, content.id)
+        for field, (low, high) in RANGES[type(content)].items():
+            self.__check_value(subject, field, getattr(content, field), low, high)
+        for field, enum_type in _enum_fields(type(content)).items():
+            if not isinstance(getattr(content, field), enum_type):
+                self.report.add(
+                    subject,
+                    "%s must be a %s, not %r",
+                    field,
+                    enum_type.__name__,
+                    getattr(content, field),
+                )
+        self.__check_texture(subject, content.texture_path)
+        key = f"{lang_prefix}.{self.namespace}:{content.id}.name"
+        self.__check_lang_key(subject, key)
+        for language in content.translations:
+            self.__check_lang_key(subject, key, language)
+
+    def __check_table(self, table):
+        # Straight over the columns, tables can have far too many rows to make an object for each.
+        # Rows are only looked at one by one when a column has a problem
+        kind = table.content_type.__name__.lower()
+        lang_prefix = "item" if table.content_type is Item else "tile"
+        ids = table.columns["id"]
+        # Removed rows stay in the columns until the table is compacted
+        rows = table.rows()
+        for row in rows:
+            if ID_PATTERN.fullmatch(ids[row]) is None:
+                self.__check_id(f"{kind} '{self.namespace}:{ids[row]}'", ids[row])
+        if self.custom_lang.get(DEFAULT_LANGUAGE):
+            for row in rows:
+                self.__check_lang_key(
+                    f"{kind} '{self.namespace}:{ids[row]}'",
+                    f"{lang_prefix}.{self.namespace}:{ids[row]}.name",
+                )
+        for field, (low, high) in RANGES[table.content_type].items():
+            # Number columns are typed arrays, only the lowest/highest value can be out of range
+            column = table.columns[field]
+            if not column or (
+                (low is None or min(column) >= low) and (high is None or max(column) <= high)
+            ):
+                continue
+            for row in rows:
+                self.__check_value(
+                    f"{kind} '{self.namespace}:{ids[row]}'", field, column[row], low, high
+                )
+        texture_paths = table.columns["texture_path"]
+        for row in rows:
+            texture_path = texture_paths[row]
+            if texture_path is not None and is_source_image(texture_path):
+                self.__check_texture(f"{kind} '{self.namespace}:{ids[row]}'", texture_path)
+
+    def __check_entity(self, entity: Entity):
+        subject = f"entity '{self.registry.identifier(entity.id)}'"
+        self.__check_id(subject, entity.id)
+        for field in ("egg_base_color", "egg_overlay_color"):
+            color = getattr(entity, field)
+            if not isinstance(color, str) or HEX_COLOR_PATTERN.fullmatch(color) is None:
+                self.report.add(
+                    subject, "%s must be a hex color like '#ff0000', not %r", field, color
+                )
+        if entity.egg_should_use_texture:
+            self.__check_texture(subject, entity.egg_texture_path)
+        self.__check_lang_key(
+            subject, f"item.spawn_egg.entity.{self.namespace}:{entity.id}.name"
+        )
+
+    def __check_reference(self, subject: str, what: str, content_id: str):
+        """
+        References without a namespace (shaped keys write them as namespace:id, see recipe.namespaced)
+        or with the addons namespace must be registered, "minecraft:" ones must be in the vanilla catalog
+        """
+        if not isinstance(content_id, str) or IDENTIFIER_PATTERN.fullmatch(content_id) is None:
+            self.report.add(subject, "%s %r isn't a valid identifier", what, content_id)
+            return
+        identifier = self.registry.identifier(content_id)
+        namespace = identifier.partition(":")[0]
+        if namespace == VANILLA_NAMESPACE:
+            # Only loaded once there is a vanilla reference
+            catalog = vanilla_catalog() if self.vanilla is None else self.vanilla
+            if catalog.has(identifier, "items", "blocks"):
+                return
+            message = catalog.unknown_message(identifier, "items", "blocks")
+            if self.allow_unknown_vanilla:
+                warning("%s: %s %s", subject, what, message)
+            else:
+                self.report.add(subject, "%s %s", what, message)
+        elif namespace == self.namespace and identifier not in self.registry:
+            self.report.add(
+                subject,
+                "%s '%s' isn't a registered item/block (vanilla ones need the minecraft: namespace)",
+                what,
+                content_id,
+            )
+
+    def __check_recipe(self, recipe: Recipe):
+        subject = f"recipe '{self.namespace}:{recipe.item_id}'"
+        valid = self.__check_id(subject, recipe.item_id)
+        if isinstance(recipe, CraftingRecipeShapeless):
+            # The result is written as namespace:result_item_id
+            valid = self.__check_id(subject, recipe.result_item_id)
+            for ingredient in recipe.ingredients:
+                if ingredient.count <= 0:
+                    self.report.add(
+                        subject, "ingredient count must be at least 1, not %r", ingredient.count
+                    )
+        if valid:
+            self.__check_reference(subject, "result", recipe_result(recipe))
+        for content_id in dict.fromkeys(recipe_ingredients(recipe)):
+            if (
+                isinstance(recipe, CraftingRecipeShapeless)
+                and isinstance(content_id, str)
+                and ":" not in content_id
+            ):
+                # Written as it is, the game reads it as a vanilla id even if an item of the addon was meant
+                self.report.add(
+                    subject,
+                    "ingredient '%s' has no namespace, use 'minecraft:%s' or '%s:%s'",
+                    content_id,
+                    content_id,
+                    self.namespace,
+                    content_id,
+                )
+                continue
+            self.__check_reference(subject, "ingredient", content_id)
+        try:
+            fingerprint = recipe_fingerprint(recipe)
+        except AddonError as err:
+            self.report.add(subject, "%s", err)
+            return
+        # Equivalent recipes share a file, different ones would overwrite each other
+        if self.recipe_files.setdefault(recipe.item_id, fingerprint) != fingerprint:
+            self.report.add(
+                subject, "another recipe with a different pattern/ingredients uses the same id"
+            )
+
+
+def validate_addon(manager) -> ValidationReport:
+    """
+    Returns every problem with the definitions of an AddonManager (see Validator)
+    """
+    return Validator(manager).run()
@@ -0,0 +1,104 @@
+import difflib
+import functools
+import gzip
+import pathlib
+from typing import Iterable
+# If you have a linter/pylint, it will show these as errors but it works and I don't know how to remove the error
+from .util import error, debug
+
+# The vanilla ids shipped with the addon manager, see VanillaCatalog.read for the format
+CATALOG_PATH = pathlib.Path(__file__).with_name("vanilla_ids.gz")
+NAMESPACE = "minecraft"
+KINDS = ("items", "blocks", "entities")
+
+
+class VanillaCatalog:
+    """
+    The item, block and entity identifiers of one vanilla version (ids are stored without "minecraft:").
+    Includes the legacy ids recipes still accept (e.g. "planks", "wool")
+    """
+
+    version: str
+    ids: dict[str, frozenset[str]]
+
+    def __init__(self, version: str, ids: dict[str, Iterable[str]]) -> None:
+        self.version = version
+        self.ids = {kind: frozenset(ids.get(kind, ())) for kind in KINDS}
+
+    @classmethod
+    def read(cls, path: pathlib.Path) -> "VanillaCatalog":
+        """
+        Load a catalog file: gzip compressed text, "minecraft (version)" on the first line
+        then a "[kind]" line before each kind's ids (one per line, sorted)
+        """
+        lines = gzip.decompress(path.read_bytes()).decode("utf-8").splitlines()
+        namespace, _, version = lines[0].partition(" ")
+        if namespace != NAMESPACE:
+            error("'%s' isn't a vanilla id catalog", path)
+        ids: dict[str, list[str]] = {}
+        kind_ids: list[str] = []
+        for line in lines[1:]:
+            if line.startswith("["):
+                kind_ids = ids.setdefault(line[1:-1], [])
+            elif line:
+                kind_ids.append(line)
+        return cls(version, ids)
+
+    def write(self, path: pathlib.Path):
+        """
+        Save the catalog in the format read() loads (e.g. after updating it to a new vanilla version)
+        """
+        lines = [f"{NAMESPACE} {self.version}"]
+        for kind in KINDS:
+            lines.append(f"[{kind}]")
+            lines.extend(sorted(self.ids[kind]))
+        # mtime=0 so the same ids always give the same file
+        path.write_bytes(gzip.compress("\n".join(lines).encode("utf-8"), 9, mtime=0))
+
+    def has(self, identifier: str, *kinds: str) -> bool:
+        """
+        Returns if the "minecraft:" identifier is a vanilla id of one of the kinds (any kind by default)
+        """
+        namespace, _, name = identifier.rpartition(":")
+        if namespace != NAMESPACE:
+            return False
+        return any(name in self.ids[kind] for kind in kinds or KINDS)
+
+    def __contains__(self, identifier: str) -> bool:
+        return self.has(identifier)
+
+    def suggest(self, identifier: str, *kinds: str, count: int = 3) -> list[str]:
+        """
+        Returns the vanilla identifiers (of the kinds) closest to a misspelled one, best match first
+        """
+        names = set().union(*(self.ids[kind] for kind in kinds or KINDS))
+        matches = difflib.get_close_matches(
+            identifier.rpartition(":")[2], sorted(names), n=count, cutoff=0.6
+        )
+        return [f"{NAMESPACE}:{name}" for name in matches]
+
+    def unknown_message(self, identifier: str, *kinds: str) -> str:
+        """
+        Returns why an identifier isn't accepted, with the closest vanilla ids as suggestions
+        """
+        what = "/".join(kind[:-1] for kind in kinds or KINDS)
+        message = f"'{identifier}' isn't a vanilla {what} (in Minecraft {self.version})"
+        suggestions = self.suggest(identifier, *kinds)
+        if suggestions:
+            message += f", did you mean {' or '.join(repr(match) for match in suggestions)}?"
+        return message
+
+    def __repr__(self) -> str:
+        counts = ", ".join(f"{kind}={len(self.ids[kind])}" for kind in KINDS)
+        return f"VanillaCatalog(version={self.version}, {counts})"
+
+
+@functools.cache
+def vanilla_catalog() -> VanillaCatalog:
+    """
+    Returns the bundled catalog, it is only loaded the first time something needs it
+    """
+    catalog = VanillaCatalog.read(CATALOG_PATH)
+    debug("Loaded %r", catalog)
+    return catalog
+
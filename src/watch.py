@@ -0,0 +1,244 @@
+import collections
+import enum
+import pathlib
+import threading
+import time
+from typing import Callable, Mapping
+# If you have a linter/pylint, it will show these as errors but it works and I don't know how to remove the error
+from .util import AddonError, error, info
+from .build_index import BuildReport
+from .loader import LoadReport, RowError, load_catalog
+from .item import Item
+from .block import Block
+from .entity import Entity
+
+
+def _snapshot(value):
+    """
+    A comparable copy of an item/block/entity/recipe (and what it holds), to tell if a reloaded one changed
+    """
+    slots = getattr(type(value), "__slots__", None)
+    if slots is not None:
+        return (type(value), tuple(_snapshot(getattr(value, slot)) for slot in slots))
+    if isinstance(value, Mapping):
+        return tuple(sorted((key, _snapshot(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_snapshot(item) for item in value)
+    if isinstance(value, enum.Enum):
+        return value.value
+    return value
+
+
+class CatalogContents:
+    """
+    What one catalog file defines, loaded without adding it to the manager (loader.load_catalog
+    only needs the add_* methods). Ids may only be used by this catalog
+    """
+
+    content: dict[str, Item | Block | Entity]
+    recipes: list
+
+    def __init__(self, manager, owned: set[str]) -> None:
+        self.registry = manager.registry
+        # Identifiers this catalog had before it was reloaded, they can be used again
+        self.owned = owned
+        self.content = {}
+        self.recipes = []
+
+    def __add(self, content: Item | Block | Entity):
+        identifier = self.registry.identifier(content.id)
+        if identifier in self.content or (
+            identifier not in self.owned and identifier in self.registry
+        ):
+            error("Duplicate identifier '%s', it is already used", identifier)
+        self.content[identifier] = content
+
+    def add_item(self, item: Item):
+        self.__add(item)
+
+    def add_block(self, block: Block):
+        self.__add(block)
+
+    def add_entity(self, entity: Entity):
+        self.__add(entity)
+
+    def add_recipe(self, recipe):
+        self.recipes.append(recipe)
+
+
+class WatchUpdate:
+    """
+    One rebuild of a Watcher: the files that changed, the definitions that changed because of them,
+    the rows and catalogs that couldn't be loaded, the build report (None if the build failed, see error)
+    and how long it took from noticing the change to the last file written
+    """
+
+    paths: list[pathlib.Path]
+    content_ids: set[str]
+    row_errors: list[RowError]
+    # Catalogs that couldn't be read at all (e.g. deleted or half written), what they defined stays
+    load_errors: dict[pathlib.Path, Exception]
+    report: BuildReport | None
+    error: AddonError | None
+    seconds: float
+
+    def __init__(self, paths: list[pathlib.Path]) -> None:
+        self.paths = paths
+        self.content_ids = set()
+        self.row_errors = []
+        self.load_errors = {}
+        self.report = None
+        self.error = None
+        self.seconds = 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"WatchUpdate(paths={len(self.paths)}, content_ids={len(self.content_ids)}, "
+            f"report={self.report}, seconds={self.seconds:.3f})"
+        )
+
+
+class Watcher:
+    """
+    Keeps an AddonManager in memory and rebuilds it when its catalog files or texture images change.
+    Reloaded catalogs are compared with what they defined before, only the definitions that changed
+    get their files written again (see AddonManager.regenerate)
+    """
+
+    interval: float
+    catalogs: dict[pathlib.Path, CatalogContents]
+    # (modification time, size) of every watched file, None if it doesn't exist
+    stats: dict[pathlib.Path, tuple[int, int] | None]
+
+    def __init__(self, manager, interval: float = 0.2) -> None:
+        """
+        interval: seconds between checking the files for changes
+        """
+        self.manager = manager
+        self.interval = interval
+        self.catalogs = {}
+        self.stats = {}
+        # Changed identifiers that weren't built yet (the last build failed)
+        self.pending: set[str] = set()
+
+    def __stat(self, path: pathlib.Path) -> tuple[int, int] | None:
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def __watch(self, path: pathlib.Path):
+        self.stats[path] = self.__stat(path)
+
+    def load_catalog(self, path: pathlib.Path) -> LoadReport:
+        """
+        Load a catalog file into the manager (like AddonManager.load_catalog) and watch it
+        """
+        info("Loading catalog '%s'", path)
+        report, _ = self.__load(path)
+        self.__watch(path)
+        return report
+
+    def __load(self, path: pathlib.Path) -> tuple[LoadReport, set[str]]:
+        """
+        (Re)load a catalog, returns the load report and the identifiers of the definitions that changed
+        """
+        old = self.catalogs.get(path)
+        contents = CatalogContents(self.manager, set() if old is None else set(old.content))
+        report = load_catalog(contents, path)
+        changed: set[str] = set()
+        old_content = {} if old is None else old.content
+        for identifier, content in list(contents.content.items()):
+            previous = old_content.get(identifier)
+            if previous is None:
+                if isinstance(content, Item):
+                    self.manager.add_item(content)
+                elif isinstance(content, Block):
+                    self.manager.add_block(content)
+                else:
+                    self.manager.add_entity(content)
+            elif _snapshot(previous) != _snapshot(content):
+                self.manager.replace(content)
+            else:
+                # Unchanged, the registered object stays
+                contents.content[identifier] = previous
+                continue
+            changed.add(identifier)
+        for identifier in old_content.keys() - contents.content.keys():
+            self.manager.remove(identifier)
+            changed.add(identifier)
+
+        # Recipes don't have an identity of their own, unchanged ones are matched by their contents
+        old_recipes = collections.defaultdict(list)
+        for recipe in [] if old is None else old.recipes:
+            old_recipes[_snapshot(recipe)].append(recipe)
+        for index, recipe in enumerate(contents.recipes):
+            same = old_recipes.get(_snapshot(recipe))
+            if same:
+                contents.recipes[index] = same.pop()
+                continue
+            self.manager.add_recipe(recipe)
+            changed.add(self.manager.registry.identifier(recipe.item_id))
+        for recipes in old_recipes.values():
+            for recipe in recipes:
+                self.manager.remove_recipe(recipe)
+                changed.add(self.manager.registry.identifier(recipe.item_id))
+
+        self.catalogs[path] = contents
+        return report, changed
+
+    def start(self):
+        """
+        Watch the texture images of the last build too, call it after the first generate()
+        """
+        for source, _ in self.manager.textures.files.values():
+            if source not in self.stats:
+                self.__watch(source)
+
+    def poll(self) -> WatchUpdate | None:
+        """
+        Rebuild if a watched file changed since the last poll, returns what was done (None if nothing changed)
+        """
+        paths = [path for path, stat in self.stats.items() if self.__stat(path) != stat]
+        if not paths:
+            return None
+        start = time.perf_counter()
+        update = WatchUpdate(paths)
+        for path in paths:
+            self.__watch(path)
+            if path in self.catalogs:
+                try:
+                    report, changed = self.__load(path)
+                except Exception as err:
+                    # Editors often replace a file instead of writing it, keep watching for the next change
+                    update.load_errors[path] = err
+                    continue
+                update.row_errors.extend(report.errors)
+                update.content_ids |= changed
+        self.pending |= update.content_ids
+        # Changed images only change the atlases, regenerate() copies them under their new hash
+        try:
+            update.report = self.manager.regenerate(self.pending)
+            self.pending = set()
+        except AddonError as err:
+            update.error = err
+        self.start()
+        update.seconds = time.perf_counter() - start
+        return update
+
+    def run(
+        self,
+        on_update: Callable[[WatchUpdate], object],
+        stop: threading.Event | None = None,
+    ):
+        """
+        Poll for changes until stop is set (or forever), on_update is called after every rebuild
+        """
+        self.start()
+        stop = threading.Event() if stop is None else stop
+        while not stop.is_set():
+            update = self.poll()
+            if update is not None:
+                on_update(update)
+            stop.wait(self.interval)